@@ -0,0 +1,158 @@
+from typing import Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import importlib
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from column_cache import build_column_cache, cache_path
+from synthetic import generate_tweets
+
+
+# Funciones a medir: nombre -> (módulo, función, opciones del motor, preparación)
+TARGETS = {
+    "q1_time": ("q1_time", "q1_time", {}, None),
+    "q1_memory": ("q1_memory", "q1_memory", {}, None),
+    "q2_time": ("q2_time", "q2_time", {}, None),
+    "q2_memory": ("q2_memory", "q2_memory", {}, None),
+    "q3_time": ("q3_time", "q3_time", {}, None),
+    "q3_memory": ("q3_memory", "q3_memory", {}, None),
+    "q1_time[numpy]": ("q1_time", "q1_time", {"backend": "numpy"}, None),
+    "q1_memory[dict]": ("q1_memory", "q1_memory", {"backend": "dict"}, None),
+    "q1_time[parallel]": ("q1_time", "q1_time", {"workers": None}, None),
+    "q1_time[full]": ("q1_time", "q1_time", {"validation": "full"}, None),
+    "q1_time[colcache]": ("q1_time", "q1_time", {"backend": "numpy"}, "colcache"),
+    "q3_memory[approx]": ("q3_memory", "q3_memory", {"approx_error": 0.001}, None),
+}
+
+
+def _run_target(module_name: str, function_name: str, file_path: str, options: dict) -> dict:
+    # Se ejecuta en un proceso nuevo: ni la memoria ni los cachés de una medición
+    # afectan a la siguiente
+    function = getattr(importlib.import_module(module_name), function_name)
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    function(file_path, **options)
+    wall_time, cpu_time = time.perf_counter() - wall_start, time.process_time() - cpu_start
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return {
+        "wall_time": wall_time,
+        "cpu_time": cpu_time + children.ru_utime + children.ru_stime,
+        "peak_rss_mb": max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, children.ru_maxrss) / 1024,
+    }
+
+
+def run_target(name: str, file_path: str, lines: int, repeat: int = 1) -> dict:
+    """
+    Mide una función en procesos aislados y devuelve la mejor de `repeat` ejecuciones.
+
+    Args:
+        name (str): Nombre del objetivo en TARGETS.
+        file_path (str): Archivo de tweets a procesar.
+        lines (int): Cantidad de líneas del archivo, para calcular líneas por segundo.
+        repeat (int): Cantidad de ejecuciones.
+
+    Returns:
+        dict: Tiempo de pared, tiempo de CPU, pico de RSS (MiB) y líneas por segundo.
+    """
+    module_name, function_name, options, setup = TARGETS[name]
+    if setup == "colcache":
+        build_column_cache(file_path, options.get("validation", "fast"))
+
+    runs = []
+    try:
+        for _ in range(repeat):
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                runs.append(executor.submit(_run_target, module_name, function_name, file_path, options).result())
+    finally:
+        shutil.rmtree(cache_path(file_path), ignore_errors=True)
+
+    best = min(runs, key=lambda run: run["wall_time"])
+    best["lines_per_sec"] = lines / best["wall_time"] if best["wall_time"] else None
+    return best
+
+
+def compare(results: List[dict], baseline: List[dict], tolerance: float) -> List[str]:
+    """
+    Compara resultados con un baseline y devuelve las regresiones encontradas.
+
+    Hay regresión si el tiempo de pared o el pico de memoria superan al baseline del mismo
+    objetivo y tamaño en más de `tolerance` (por ejemplo 0.2 = 20 %).
+    """
+    reference = {(item["target"], item["lines"]): item for item in baseline}
+    regressions = []
+    for item in results:
+        base = reference.get((item["target"], item["lines"]))
+        if base is None:
+            continue
+        for metric in ("wall_time", "peak_rss_mb"):
+            if item[metric] > base[metric] * (1 + tolerance):
+                regressions.append(
+                    f"{item['target']} ({item['lines']} lines): {metric} {item[metric]:.3f} > baseline {base[metric]:.3f}"
+                )
+    return regressions
+
+
+def run_benchmarks(sizes: List[int], targets: List[str], repeat: int = 1,
+                   workdir: Optional[str] = None) -> Dict[str, object]:
+    """
+    Genera archivos sintéticos de cada tamaño y mide todos los objetivos sobre ellos.
+
+    Args:
+        sizes (List[int]): Cantidades de tweets de los archivos sintéticos.
+        targets (List[str]): Nombres de objetivos de TARGETS a medir.
+        repeat (int): Ejecuciones por objetivo; se reporta la más rápida.
+        workdir (Optional[str]): Directorio para los archivos generados (por defecto, uno temporal).
+
+    Returns:
+        Dict[str, object]: Información del entorno y la lista de resultados.
+    """
+    results = []
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        for lines in sizes:
+            file_path = os.path.join(tmp, f"tweets-{lines}.json")
+            generate_tweets(file_path, lines)
+            size_mb = os.path.getsize(file_path) / 1024 ** 2
+            for name in targets:
+                result = {"target": name, "lines": lines, "file_mb": size_mb}
+                result.update(run_target(name, file_path, lines, repeat))
+                print(json.dumps(result), file=sys.stderr)
+                results.append(result)
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Mide tiempo y memoria de las funciones qN_* sobre datos sintéticos.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--targets", nargs="+", default=list(TARGETS), choices=list(TARGETS))
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--output", help="Archivo JSON donde guardar los resultados")
+    parser.add_argument("--baseline", help="Archivo JSON de resultados previos contra el cual comparar")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.sizes, args.targets, args.repeat)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output)
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(report["results"], json.load(file)["results"], args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
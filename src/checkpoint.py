@@ -0,0 +1,87 @@
+from typing import Optional
+import hashlib
+import os
+import pickle
+
+
+# Versión del formato; si cambia, los checkpoints anteriores se descartan
+CHECKPOINT_VERSION = 2
+
+# Bytes al inicio y antes del offset que identifican el archivo ya procesado
+FINGERPRINT_SPAN = 64 * 1024
+
+
+def fingerprint(file_path: str, offset: int) -> str:
+    """
+    Calcula una huella de la parte ya procesada de un archivo: su inicio y los bytes
+    inmediatamente anteriores al offset. Si el archivo solo creció por el final, la huella
+    no cambia; si fue reemplazado o reescrito, sí.
+
+    Args:
+        file_path (str): La ruta al archivo.
+        offset (int): Cantidad de bytes ya procesados.
+
+    Returns:
+        str: La huella en hexadecimal.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as file:
+        digest.update(file.read(min(offset, FINGERPRINT_SPAN)))
+        file.seek(max(offset - FINGERPRINT_SPAN, 0))
+        digest.update(file.read(min(offset, FINGERPRINT_SPAN)))
+    return digest.hexdigest()
+
+
+def save_checkpoint(checkpoint_path: str, file_path: str, offset: int, config: dict, result: dict) -> None:
+    """
+    Guarda el estado de los agregadores y el offset procesado en un checkpoint.
+
+    La escritura es atómica: se escribe un archivo temporal y luego se reemplaza el anterior,
+    de modo que una interrupción nunca deja un checkpoint a medio escribir.
+
+    Args:
+        checkpoint_path (str): La ruta del archivo de checkpoint.
+        file_path (str): La ruta al archivo de tweets procesado.
+        offset (int): Byte hasta el cual se procesó el archivo (inicio de una línea).
+        config (dict): Configuración de los agregadores (ver engine.new_result).
+        result (dict): Agregadores con el estado acumulado hasta `offset`.
+    """
+    state = {
+        "version": CHECKPOINT_VERSION,
+        "offset": offset,
+        "fingerprint": fingerprint(file_path, offset),
+        "config": config,
+        "result": result,
+    }
+    tmp_path = checkpoint_path + ".tmp"
+    with open(tmp_path, "wb") as file:
+        pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, checkpoint_path)
+
+
+def load_checkpoint(checkpoint_path: str, file_path: str, config: dict) -> Optional[dict]:
+    """
+    Carga un checkpoint si corresponde al archivo y a la configuración actuales.
+
+    Args:
+        checkpoint_path (str): La ruta del archivo de checkpoint.
+        file_path (str): La ruta al archivo de tweets.
+        config (dict): Configuración de los agregadores esperada.
+
+    Returns:
+        Optional[dict]: El estado guardado (con "offset" y "result"), o None si no existe,
+                        es de otra versión o configuración, o el archivo cambió antes del offset.
+    """
+    try:
+        with open(checkpoint_path, "rb") as file:
+            state = pickle.load(file)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+
+    if state.get("version") != CHECKPOINT_VERSION or state["config"] != config:
+        return None
+    if os.path.getsize(file_path) < state["offset"]:
+        return None
+    if state["fingerprint"] != fingerprint(file_path, state["offset"]):
+        return None
+    return state
@@ -0,0 +1,117 @@
+from collections import OrderedDict
+from typing import Dict, Optional
+import hashlib
+import os
+import pickle
+import threading
+
+
+# ========================
+# Caché de resultados
+# ========================
+
+def cache_key(bucket_name: str, generations: Dict[str, int], config: Optional[dict] = None) -> str:
+    """
+    Construye la llave del caché a partir del bucket, la generación de cada archivo y la
+    configuración de la consulta.
+
+    GCS asigna una generación nueva cada vez que un archivo se sobrescribe, así que la llave
+    cambia si cualquiera de los archivos cambia, sin necesidad de descargarlos.
+
+    Args:
+        bucket_name (str): El nombre del bucket de GCS.
+        generations (Dict[str, int]): Generación de cada archivo, por ruta.
+        config (Optional[dict]): Opciones que cambian el resultado (consultas, validación, etc.).
+
+    Returns:
+        str: La llave, en hexadecimal.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(bucket_name.encode("utf-8"))
+    for file_path, generation in generations.items():
+        digest.update(b"\0" + file_path.encode("utf-8") + b"#" + str(generation).encode("ascii"))
+    digest.update(b"\0" + repr(sorted((config or {}).items())).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class MemoryCache:
+    """
+    Caché LRU en la memoria del proceso. Sobrevive entre solicitudes de una misma instancia.
+
+    Attributes:
+        maxsize (int): Cantidad máxima de resultados guardados.
+    """
+
+    def __init__(self, maxsize: int = 32):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[object]:
+        with self._lock:
+            if key not in self._items:
+                return None
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def set(self, key: str, value: object) -> None:
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            if len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+
+class FileCache:
+    """
+    Caché en un directorio: un archivo pickle por llave. Con un directorio compartido
+    (por ejemplo, un volumen montado) el caché se comparte entre instancias.
+
+    Attributes:
+        directory (str): Directorio donde se guardan los resultados.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".pkl")
+
+    def get(self, key: str) -> Optional[object]:
+        try:
+            with open(self._path(key), "rb") as file:
+                return pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+    def set(self, key: str, value: object) -> None:
+        # Escritura atómica: un lector nunca ve un archivo a medio escribir
+        tmp_path = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as file:
+            pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self._path(key))
+
+
+def result_cache_from_env() -> Optional[object]:
+    """
+    Crea el caché de resultados según la variable de entorno RESULT_CACHE.
+
+    - "memory" (por defecto): MemoryCache, de tamaño RESULT_CACHE_SIZE (32 por defecto).
+    - "file:<directorio>": FileCache en ese directorio.
+    - "none": sin caché.
+
+    Cualquier objeto con métodos get(key) y set(key, value) sirve como backend, por lo que
+    un almacén externo (por ejemplo, Redis) se conecta con un adaptador de dos métodos.
+
+    Returns:
+        Optional[object]: El caché, o None si está desactivado.
+    """
+    setting = os.environ.get("RESULT_CACHE", "memory")
+    if setting == "none":
+        return None
+    if setting.startswith("file:"):
+        return FileCache(setting[len("file:"):])
+    if setting == "memory":
+        return MemoryCache(int(os.environ.get("RESULT_CACHE_SIZE", "32")))
+    raise ValueError(f"RESULT_CACHE desconocido: {setting}")
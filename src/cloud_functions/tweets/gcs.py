@@ -0,0 +1,106 @@
+from typing import Dict, Iterator, List, Optional
+import threading
+from compressed import iter_stream_lines, open_decompressed
+
+
+# ========================
+# Leer archivo json de GCP
+# ========================
+
+# Tamaño de cada lectura al bucket; acota la memoria del buffer de líneas
+CHUNK_SIZE = 8 * 1024 * 1024
+
+# Cliente de storage del proceso, creado en la primera solicitud y reutilizado por las
+# siguientes (instancias "tibias"), junto con su pool de conexiones HTTP
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """
+    Devuelve el cliente de storage compartido por el proceso, creándolo si no existe.
+
+    La importación de google.cloud.storage y la obtención de credenciales se hacen aquí y
+    no al importar el módulo, de modo que solo las paga la primera solicitud. El cliente es
+    seguro para usarlo desde varios hilos.
+
+    Returns:
+        storage.Client: El cliente de Cloud Storage.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from google.cloud import storage
+                _client = storage.Client()
+    return _client
+
+
+def iter_lines_from_gcs(bucket_name: str, file_path: str, chunk_size: int = CHUNK_SIZE, client=None,
+                        generation: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Lee un archivo desde Google Cloud Storage por bloques y entrega sus líneas. Los archivos
+    .gz y .zst se descomprimen como flujo, sin guardar el archivo completo en memoria.
+
+    Args:
+        bucket_name (str): El nombre del bucket de GCS.
+        file_path (str): La ruta del archivo dentro del bucket.
+        chunk_size (int): Cantidad de bytes descargados por lectura.
+        client: Cliente de storage; permite usar un cliente falso en pruebas locales.
+                Si no se entrega, se usa el cliente compartido (ver `get_client`).
+        generation (Optional[int]): Generación del archivo a leer. Fijarla asegura que se lee
+                                    exactamente la versión consultada antes (por ejemplo, la
+                                    que forma la llave del caché de resultados).
+
+    Returns:
+        Iterator[bytes]: Las líneas del archivo, sin el salto de línea.
+    """
+    client = client or get_client()
+    blob = client.bucket(bucket_name).blob(file_path, generation=generation)
+    with blob.open("rb", chunk_size=chunk_size) as reader:
+        # Los archivos .gz y .zst se descomprimen a medida que se descargan
+        yield from iter_stream_lines(open_decompressed(reader, file_path), chunk_size)
+
+
+def list_objects(bucket_name: str, prefix: str, client=None) -> Dict[str, int]:
+    """
+    Lista los archivos de un bucket cuyo nombre comienza con un prefijo, con su generación.
+
+    Args:
+        bucket_name (str): El nombre del bucket de GCS.
+        prefix (str): Prefijo de las rutas, por ejemplo "tweets/2021-02/".
+        client: Cliente de storage; si no se entrega, se usa el cliente compartido.
+
+    Returns:
+        Dict[str, int]: Generación de cada archivo, por ruta y en orden alfabético. Se omiten
+                        los marcadores de carpeta (rutas terminadas en "/").
+    """
+    client = client or get_client()
+    blobs = client.list_blobs(bucket_name, prefix=prefix)
+    return dict(sorted((blob.name, blob.generation) for blob in blobs if not blob.name.endswith("/")))
+
+
+def get_generations(bucket_name: str, file_paths: List[str], client=None) -> Dict[str, int]:
+    """
+    Consulta la generación actual de cada archivo (solo metadatos, sin descargarlo).
+
+    Args:
+        bucket_name (str): El nombre del bucket de GCS.
+        file_paths (List[str]): Las rutas de los archivos dentro del bucket.
+        client: Cliente de storage; si no se entrega, se usa el cliente compartido.
+
+    Returns:
+        Dict[str, int]: Generación de cada archivo, por ruta y en el orden de `file_paths`.
+
+    Raises:
+        FileNotFoundError: Si alguno de los archivos no existe.
+    """
+    client = client or get_client()
+    bucket = client.bucket(bucket_name)
+    generations = {}
+    for file_path in file_paths:
+        blob = bucket.get_blob(file_path)
+        if blob is None:
+            raise FileNotFoundError(f"gs://{bucket_name}/{file_path}")
+        generations[file_path] = blob.generation
+    return generations
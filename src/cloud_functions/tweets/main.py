@@ -0,0 +1,216 @@
+import time
+_IMPORT_START = time.perf_counter()
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import importlib.util
+import os
+import sys
+import ujson
+
+if importlib.util.find_spec("engine") is None:
+    # En el despliegue, el núcleo compartido (engine.py, utils.py, etc.) se copia junto a este
+    # archivo; en el repositorio se importa desde src/
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from engine import AGGREGATORS, merge_results, new_result, process_lines
+from instrumentation import recorder
+from gcs import iter_lines_from_gcs, list_objects, get_generations, get_client
+from cache import cache_key, result_cache_from_env
+
+# Segundos que tomó importar el módulo (incluye el núcleo compartido y los modelos de pydantic).
+# Es la parte del arranque en frío que ocurre antes de la primera solicitud.
+IMPORT_SECONDS = time.perf_counter() - _IMPORT_START
+
+# Si la instancia ya atendió una solicitud
+_warm = False
+
+# Caché de resultados por bucket y generación de los archivos (ver cache.py)
+result_cache = result_cache_from_env()
+
+# Memoria de la instancia en MiB; debe coincidir con --memory del despliegue
+MEMORY_MB = int(os.environ.get("MEMORY_MB", 512))
+
+# Memoria reservada para el intérprete, las bibliotecas y el resultado combinado (MiB)
+BASE_MEMORY_MB = 192
+
+# Memoria de cada descarga en curso (MiB): el bloque de gcs.CHUNK_SIZE recién leído, el
+# anterior partido en líneas, un lote de DOWNLOAD_BATCH_SIZE tweets parseados (completos con
+# validation="full") y los agregados parciales del archivo
+DOWNLOAD_MEMORY_MB = 96
+
+# Líneas por lote de cada descarga: menos que engine.BATCH_SIZE, ya que hay varios lotes a la vez
+DOWNLOAD_BATCH_SIZE = 512
+
+# Cantidad máxima de archivos que se descargan al mismo tiempo, según la memoria disponible
+# (3 con 512 MiB)
+MAX_CONCURRENCY = max(1, min(8, (MEMORY_MB - BASE_MEMORY_MB) // DOWNLOAD_MEMORY_MB))
+
+# Consultas disponibles: q1 (fechas con más tweets), q2 (emojis) y q3 (menciones)
+QUERIES = tuple(AGGREGATORS)
+
+
+def analyze_object(bucket_name: str, file_path: str, queries: Tuple[str, ...] = QUERIES, client=None,
+                   generation: Optional[int] = None, **config) -> Dict[str, object]:
+    """
+    Calcula los agregados de las consultas pedidas para un archivo de Cloud Storage,
+    procesando cada tweet a medida que llega.
+
+    Args:
+        bucket_name (str): El nombre del bucket de GCS.
+        file_path (str): La ruta del archivo dentro del bucket.
+        queries (Tuple[str, ...]): Consultas a calcular ("q1", "q2" y/o "q3").
+        client: Cliente de storage compartido entre descargas.
+        generation (Optional[int]): Generación del archivo a leer (por defecto, la actual).
+        **config: Configuración de los agregadores (ver `engine.new_result`).
+
+    Returns:
+        Dict[str, object]: Agregadores parciales indexados por pregunta, como en el motor local.
+    """
+    result = new_result(**config)
+    lines = iter_lines_from_gcs(bucket_name, file_path, client=client, generation=generation)
+    process_lines(lines, [result[name] for name in queries], result["validation"], DOWNLOAD_BATCH_SIZE)
+    return result
+
+
+def analyze_objects(bucket_name: str, file_paths: List[str], queries: Tuple[str, ...] = QUERIES, client=None,
+                    max_concurrency: int = MAX_CONCURRENCY, generations: Optional[Dict[str, int]] = None,
+                    **config) -> Dict[str, object]:
+    """
+    Calcula los agregados de varios archivos de Cloud Storage, descargándolos en paralelo con
+    un pool de hilos de tamaño acotado, y combina los parciales.
+
+    El resultado es el mismo que al leer los archivos uno tras otro: los empates se resuelven
+    por llave (ver heavy_hitters.top_items), no por el orden en que terminan las descargas.
+
+    Args:
+        bucket_name (str): El nombre del bucket de GCS.
+        file_paths (List[str]): Las rutas de los archivos dentro del bucket.
+        queries (Tuple[str, ...]): Consultas a calcular ("q1", "q2" y/o "q3").
+        client: Cliente de storage; si no se entrega, se usa el cliente compartido del proceso.
+        max_concurrency (int): Cantidad máxima de descargas simultáneas.
+        generations (Optional[Dict[str, int]]): Generación a leer de cada archivo.
+        **config: Configuración de los agregadores (ver `engine.new_result`).
+
+    Returns:
+        Dict[str, object]: Agregadores indexados por pregunta.
+    """
+    client = client or get_client()
+    generations = generations or {}
+
+    def analyze(file_path: str) -> Dict[str, object]:
+        return analyze_object(bucket_name, file_path, queries, client, generations.get(file_path), **config)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(file_paths)))) as executor:
+        return merge_results(executor.map(analyze, file_paths), **config)
+
+
+def answer(request_json: dict, queries: Tuple[str, ...]) -> Tuple[Dict[str, list], Dict[str, object]]:
+    """
+    Resuelve una solicitud: consulta las generaciones, usa el caché de resultados si ningún
+    archivo cambió y, si no, descarga y procesa los archivos una sola vez para todas las
+    consultas pedidas.
+
+    Args:
+        request_json (dict): Cuerpo de la solicitud (ver `tweets`).
+        queries (Tuple[str, ...]): Consultas a responder.
+
+    Returns:
+        Tuple[Dict[str, list], Dict[str, object]]: El top 10 de cada consulta y las métricas.
+    """
+    global _warm
+    cold_start, _warm = not _warm, True
+    setup_start = time.perf_counter()
+
+    bucket_name = request_json['bucket_name']
+    client = get_client()  # Solo la primera solicitud del proceso crea el cliente
+
+    # Consultar la generación de cada archivo: es solo una lectura de metadatos
+    if 'prefix' in request_json:
+        generations = list_objects(bucket_name, request_json['prefix'], client)
+    else:
+        file_paths = request_json.get('file_paths') or [request_json['file_path']]
+        generations = get_generations(bucket_name, file_paths, client)
+    file_paths = list(generations)
+    max_concurrency = min(int(request_json.get('max_concurrency', MAX_CONCURRENCY)), MAX_CONCURRENCY)
+    # Por defecto se valida el TweetModel completo, como la función original de q1
+    config = {
+        "validation": request_json.get('validation', "full"),
+        "approx_error": request_json.get('approx_error'),
+    }
+    use_cache = result_cache is not None and request_json.get('use_cache', True)
+    key = cache_key(bucket_name, generations, {"queries": queries, **config})
+    process_start = time.perf_counter()
+
+    # Si ningún archivo cambió desde la última consulta, se devuelve el resultado guardado
+    # sin descargar nada
+    answers = result_cache.get(key) if use_cache else None
+    cache_hit = answers is not None
+    pipeline = rejections = None
+    if not cache_hit:
+        # Con TWEETS_METRICS=1 se mide además cada etapa del procesamiento
+        with recorder.recording("tweets", bucket_name=bucket_name, objects=len(file_paths), **config) as run:
+            result = analyze_objects(bucket_name, file_paths, queries, client, max_concurrency, generations, **config)
+            answers = {name: result[name].top(10) for name in queries}
+        pipeline = run["report"]
+        rejections = result["validation"].summary()
+        if use_cache:
+            result_cache.set(key, answers)
+
+    # Métricas de arranque: en una instancia tibia setup_seconds no incluye crear el cliente
+    metrics = {
+        "cold_start": cold_start,
+        "import_seconds": IMPORT_SECONDS if cold_start else 0.0,
+        "setup_seconds": process_start - setup_start,
+        "processing_seconds": time.perf_counter() - process_start,
+        "objects": len(file_paths),
+        "queries": list(queries),
+        "cache_hit": cache_hit,
+    }
+    if rejections is not None:
+        # Conteos por campo y tipo de error y algunos ejemplos, en lugar de un log por tweet
+        metrics["rejections"] = rejections
+    if pipeline is not None:
+        metrics["pipeline"] = pipeline
+    print(ujson.dumps({"message": "tweets metrics", **metrics}))  # Log estructurado para Cloud Logging
+    return answers, metrics
+
+
+def tweets(request):
+    """
+    Usage:
+        {
+            "bucket_name": "gcs-bucket-gtest-dev",
+            "file_path": "tweets/farmers-protest-tweets-2021-2-4.json",
+            "queries": ["q1", "q2", "q3"]
+        }
+
+        "queries" es opcional (por defecto, las tres); todas se calculan en una sola lectura.
+        En lugar de "file_path" se puede entregar "file_paths" (lista de archivos) o "prefix"
+        (todos los archivos bajo ese prefijo). Opciones: "max_concurrency", "validation"
+        ("full" o "fast"), "approx_error" (top-k aproximado para q2 y q3) y "use_cache".
+    """
+
+    request_json = request.get_json(silent=True)
+    queries = tuple(request_json.get('queries') or QUERIES)
+    unknown = [name for name in queries if name not in AGGREGATORS]
+    if unknown:
+        return {'error': f"Consultas desconocidas: {unknown}"}, 400
+
+    answers, metrics = answer(request_json, queries)
+    return {**answers, 'metrics': metrics}
+
+
+def q1_memory(request):
+    """
+    Usage:
+        {
+            "bucket_name": "gcs-bucket-gtest-dev",
+            "file_path": "tweets/farmers-protest-tweets-2021-2-4.json"
+        }
+
+        Alias de `tweets` restringido a q1, con la respuesta original ({"top_dates": [...]}).
+    """
+
+    request_json = request.get_json(silent=True)
+    answers, metrics = answer(request_json, ("q1",))
+    return {'top_dates': answers["q1"], 'metrics': metrics}
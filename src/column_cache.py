@@ -0,0 +1,253 @@
+from typing import Iterator, List, Optional
+from collections import Counter
+from array import array
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import sys
+import numpy as np
+from utils import VALIDATORS, day_ordinal
+from extraction import extract_emojis, extract_mentions, emoji_pattern, mention_pattern
+from projection import tweet_loader
+from readers import RELEASE_EVERY, iter_lines, map_file, release_pages
+
+
+# Versión del formato; si cambia, los cachés anteriores se reconstruyen
+CACHE_VERSION = 2
+CACHE_SUFFIX = ".colcache"
+
+
+# ========================
+# Columnas en disco
+# ========================
+
+class ColumnCache:
+    """
+    Columnas proyectadas de los tweets válidos de un archivo, leídas desde el caché en disco.
+
+    Las filas conservan el orden del archivo original. Los agregados calculados a partir de
+    ellas coinciden con los del archivo, ya que los empates se resuelven por llave y no por
+    orden de aparición (ver heavy_hitters.top_items).
+
+    Attributes:
+        day (np.ndarray): Ordinal de la fecha de cada tweet (date.toordinal()).
+        user (np.ndarray): Id del usuario de cada tweet, índice en `usernames`.
+        usernames (List[str]): Diccionario de nombres de usuario.
+        content_offsets (np.ndarray): Inicio y fin de cada contenido dentro de `content.bin`.
+        emoji (np.ndarray): Ids de los emojis de todos los tweets, índices en `emojis`.
+        emoji_offsets (np.ndarray): Para la fila i, sus emojis son emoji[emoji_offsets[i]:emoji_offsets[i + 1]].
+        emojis (List[str]): Diccionario de emojis.
+        mention (np.ndarray): Ids de los usuarios mencionados en todos los tweets, índices en `mentions`.
+        mention_offsets (np.ndarray): Para la fila i, sus menciones son mention[mention_offsets[i]:mention_offsets[i + 1]].
+        mentions (List[str]): Diccionario de usuarios mencionados.
+        rejections (Counter): Rechazos por campo registrados al construir el caché.
+        errors (Counter): Errores por (campo, tipo) registrados al construir el caché.
+        rejected (int): Cantidad de tweets rechazados.
+        samples (List[dict]): Ejemplos de líneas rechazadas (ver rejections.RejectionLog).
+    """
+
+    def __init__(self, path: str, meta: dict):
+        self.path = path
+        self.rows = meta["rows"]
+        self.rejections = Counter(meta["rejections"])
+        self.errors = Counter({(field, kind): count for field, kind, count in meta.get("errors", [])})
+        self.rejected = meta.get("rejected", 0)
+        self.samples = meta.get("samples", [])
+        self.day = np.load(os.path.join(path, "day.npy"), mmap_mode="r")
+        self.user = np.load(os.path.join(path, "user.npy"), mmap_mode="r")
+        self.content_offsets = np.load(os.path.join(path, "content_offsets.npy"), mmap_mode="r")
+        self.usernames = _read_strings(path, "usernames")
+        self.emoji = np.load(os.path.join(path, "emoji.npy"), mmap_mode="r")
+        self.emoji_offsets = np.load(os.path.join(path, "emoji_offsets.npy"), mmap_mode="r")
+        self.emojis = _read_strings(path, "emojis")
+        self.mention = np.load(os.path.join(path, "mention.npy"), mmap_mode="r")
+        self.mention_offsets = np.load(os.path.join(path, "mention_offsets.npy"), mmap_mode="r")
+        self.mentions = _read_strings(path, "mentions")
+
+    def iter_content(self) -> Iterator[str]:
+        """
+        Itera el contenido de cada tweet en el orden del archivo.
+        """
+        offsets = self.content_offsets.tolist()
+        with open(os.path.join(self.path, "content.bin"), "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                yield from ("" for _ in range(self.rows))
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                for start, end in zip(offsets, offsets[1:]):
+                    yield content[start:end].decode("utf-8")
+
+
+def cache_path(file_path: str) -> str:
+    """
+    Devuelve la ruta del caché columnar asociado a un archivo de tweets.
+    """
+    return file_path + CACHE_SUFFIX
+
+
+def _write_strings(path: str, name: str, values: List[str]) -> None:
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    np.save(os.path.join(path, name + "_offsets.npy"), offsets)
+    with open(os.path.join(path, name + ".bin"), "wb") as file:
+        file.write(b"".join(encoded))
+
+
+def _read_strings(path: str, name: str) -> List[str]:
+    offsets = np.load(os.path.join(path, name + "_offsets.npy")).tolist()
+    with open(os.path.join(path, name + ".bin"), "rb") as file:
+        data = file.read()
+    return [data[start:end].decode("utf-8") for start, end in zip(offsets, offsets[1:])]
+
+
+def _encode(values: List[str], table: dict, ids: array, offsets: array) -> None:
+    # Agrega los valores de una fila codificados con diccionario y el offset donde termina
+    ids.extend([table.setdefault(value, len(table)) for value in values])
+    offsets.append(len(ids))
+
+
+def _save_encoded(path: str, name: str, table: dict, ids: array, offsets: array) -> None:
+    np.save(os.path.join(path, name + ".npy"), np.frombuffer(ids, dtype=np.int32))
+    np.save(os.path.join(path, name + "_offsets.npy"), np.frombuffer(offsets, dtype=np.int64))
+    _write_strings(path, name + "s", list(table))
+
+
+def file_hash(file_path: str) -> str:
+    """
+    Calcula el hash (blake2b) del contenido de un archivo, leyéndolo desde su mapeo en memoria.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    mapped = map_file(file_path)
+    if mapped is not None:
+        with mapped:
+            view = memoryview(mapped)
+            for start in range(0, len(mapped), RELEASE_EVERY):
+                digest.update(view[start:start + RELEASE_EVERY])
+                release_pages(mapped, start, start + RELEASE_EVERY)
+            del view
+    return digest.hexdigest()
+
+
+# ========================
+# Ingesta
+# ========================
+
+def build_column_cache(file_path: str, validation: str = "fast") -> str:
+    """
+    Lee el archivo de tweets una vez y escribe junto a él un caché columnar con la fecha
+    (ordinal), el usuario (codificado con diccionario) y el contenido de cada tweet válido.
+
+    Los emojis (q2) y las menciones (q3) de cada tweet se extraen también aquí y se guardan
+    codificados con diccionario, así que una ejecución sobre el caché solo cuenta ids.
+
+    El caché queda asociado al tamaño, fecha de modificación y hash del archivo, y al modo
+    de validación usado para filtrar las filas.
+
+    Args:
+        file_path (str): La ruta al archivo JSON que contiene los tweets.
+        validation (str): Modo de validación ("fast" o "full", ver utils.VALIDATORS).
+
+    Returns:
+        str: La ruta del directorio del caché.
+    """
+    path = cache_path(file_path)
+    tmp_path = path + ".tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    validator = VALIDATORS[validation](("date", "user.username", "content"))
+    loads = tweet_loader(validator.full_tweet)
+    stat = os.stat(file_path)
+
+    days = array("i")
+    users = array("i")
+    user_ids = {}
+    content_offsets = array("q", [0])
+    emoji_ids, emoji, emoji_offsets = {}, array("i"), array("q", [0])
+    mention_ids, mention, mention_offsets = {}, array("i"), array("q", [0])
+
+    with open(os.path.join(tmp_path, "content.bin"), "wb") as content_file:
+        for line in iter_lines(file_path):
+            tweet = loads(line)
+            if not validator(tweet):
+                validator.reject([line], [tweet])
+                continue
+
+            days.append(day_ordinal(tweet["date"]))
+            users.append(user_ids.setdefault(tweet["user"]["username"], len(user_ids)))
+
+            content = tweet.get("content") or ""
+            _encode(extract_emojis(content, emoji_pattern), emoji_ids, emoji, emoji_offsets)
+            _encode(extract_mentions(content, mention_pattern), mention_ids, mention, mention_offsets)
+            content = content.encode("utf-8")
+            content_file.write(content)
+            content_offsets.append(content_offsets[-1] + len(content))
+
+    np.save(os.path.join(tmp_path, "day.npy"), np.frombuffer(days, dtype=np.int32))
+    np.save(os.path.join(tmp_path, "user.npy"), np.frombuffer(users, dtype=np.int32))
+    np.save(os.path.join(tmp_path, "content_offsets.npy"), np.frombuffer(content_offsets, dtype=np.int64))
+    _write_strings(tmp_path, "usernames", list(user_ids))
+    _save_encoded(tmp_path, "emoji", emoji_ids, emoji, emoji_offsets)
+    _save_encoded(tmp_path, "mention", mention_ids, mention, mention_offsets)
+
+    meta = {
+        "version": CACHE_VERSION,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "hash": file_hash(file_path),
+        "validation": validation,
+        "rows": len(days),
+        "rejections": dict(validator.rejections),
+        "errors": [[field, kind, count] for (field, kind), count in validator.errors.items()],
+        "rejected": validator.rejected,
+        "samples": validator.log.samples,
+    }
+    with open(os.path.join(tmp_path, "meta.json"), "w") as file:
+        json.dump(meta, file)
+
+    # Reemplazar el caché anterior solo cuando el nuevo está completo
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_column_cache(file_path: str, validation: str = "fast") -> Optional[ColumnCache]:
+    """
+    Carga el caché columnar de un archivo si existe y corresponde a su contenido actual.
+
+    Si el tamaño y la fecha de modificación coinciden, el caché se usa directamente. Si solo
+    cambió la fecha de modificación (por ejemplo, al copiar el archivo), se compara el hash
+    del contenido antes de usarlo.
+
+    Args:
+        file_path (str): La ruta al archivo JSON que contiene los tweets.
+        validation (str): Modo de validación con el que se debe haber construido el caché.
+
+    Returns:
+        Optional[ColumnCache]: Las columnas del caché, o None si no hay un caché válido.
+    """
+    path = cache_path(file_path)
+    try:
+        with open(os.path.join(path, "meta.json")) as file:
+            meta = json.load(file)
+    except (OSError, ValueError):
+        return None
+
+    stat = os.stat(file_path)
+    if meta.get("version") != CACHE_VERSION or meta["validation"] != validation or meta["size"] != stat.st_size:
+        return None
+    if meta["mtime_ns"] != stat.st_mtime_ns:
+        if meta["hash"] != file_hash(file_path):
+            return None
+        meta["mtime_ns"] = stat.st_mtime_ns
+        with open(os.path.join(path, "meta.json"), "w") as file:
+            json.dump(meta, file)
+    return ColumnCache(path, meta)
+
+
+if __name__ == '__main__':
+    file_path = sys.argv[1] if len(sys.argv) > 1 else "src/data/farmers-protest-tweets-2021-2-4.json"
+    print(build_column_cache(file_path))
@@ -0,0 +1,308 @@
+from typing import BinaryIO, Callable, Iterator, List, NamedTuple, Optional, Tuple
+from functools import lru_cache
+import argparse
+import gzip
+import mmap
+import os
+import struct
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # zstandard es opcional: sin él solo se leen archivos .gz
+    zstandard = None
+
+
+# Extensiones de los archivos comprimidos que se leen de forma transparente
+COMPRESSED_SUFFIXES = (".gz", ".zst")
+
+# Tamaño de cada lectura del flujo descomprimido
+CHUNK_SIZE = 8 * 1024 * 1024
+
+# Tamaño (descomprimido) de cada bloque al escribir con `write_blocked`. BGZF limita cada
+# bloque a 64 KiB; los frames de zstd pueden ser más grandes.
+BGZF_BLOCK_SIZE = 64 * 1024 - 256
+ZSTD_FRAME_SIZE = 4 * 1024 * 1024
+
+_SKIPPABLE_MAGIC = 0x184D2A5E
+_SEEKABLE_MAGIC = 0x8F92EAB1
+
+
+class Block(NamedTuple):
+    """
+    Bloque comprimido que se puede descomprimir por sí solo (un bloque BGZF o un frame de zstd).
+
+    Attributes:
+        offset (int): Posición del bloque en el archivo comprimido.
+        size (int): Tamaño comprimido.
+        raw_offset (int): Posición de su contenido en el flujo descomprimido.
+        raw_size (int): Tamaño descomprimido.
+    """
+    offset: int
+    size: int
+    raw_offset: int
+    raw_size: int
+
+
+def is_compressed(file_path: str) -> bool:
+    """
+    Indica si la ruta corresponde a un archivo comprimido (.gz o .zst).
+    """
+    return file_path.endswith(COMPRESSED_SUFFIXES)
+
+
+def _require_zstandard() -> None:
+    if zstandard is None:
+        raise ImportError("Leer archivos .zst requiere el paquete zstandard")
+
+
+def open_decompressed(reader: BinaryIO, file_path: str) -> BinaryIO:
+    """
+    Envuelve un lector binario para leer el contenido descomprimido como flujo, sin
+    descomprimir el archivo completo en memoria.
+
+    Args:
+        reader (BinaryIO): Lector del archivo comprimido (local o de GCS).
+        file_path (str): Nombre del archivo; su extensión indica el formato.
+
+    Returns:
+        BinaryIO: Lector del contenido descomprimido. Si la ruta no es de un archivo
+                  comprimido, se devuelve el mismo lector.
+    """
+    if file_path.endswith(".gz"):
+        return gzip.GzipFile(fileobj=reader)
+    if file_path.endswith(".zst"):
+        _require_zstandard()
+        return zstandard.ZstdDecompressor().stream_reader(reader, read_across_frames=True)
+    return reader
+
+
+def iter_stream_lines(reader: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Entrega las líneas de un lector binario a medida que llegan los bloques.
+
+    El buffer solo guarda el bloque actual y la línea incompleta que quedó del anterior,
+    por lo que la memoria no depende del tamaño total del archivo.
+
+    Args:
+        reader (BinaryIO): Objeto con método read(n) que devuelve bytes.
+        chunk_size (int): Cantidad de bytes por lectura.
+
+    Returns:
+        Iterator[bytes]: Las líneas del archivo, sin el salto de línea.
+    """
+    pending = b""
+    while True:
+        chunk = reader.read(chunk_size)
+        if not chunk:
+            break
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        yield from lines
+    if pending:
+        yield pending
+
+
+# ========================
+# Bloques independientes
+# ========================
+
+def _bgzf_blocks(data: bytes) -> Optional[List[Block]]:
+    # Cada bloque BGZF es un miembro gzip con el subcampo extra "BC", que guarda su tamaño
+    # comprimido; el tamaño descomprimido (ISIZE) está en sus últimos 4 bytes
+    blocks = []
+    offset = raw_offset = 0
+    while offset < len(data):
+        header = data[offset:offset + 18]
+        if len(header) < 18 or header[:4] != b"\x1f\x8b\x08\x04" or header[12:14] != b"BC":
+            return None
+        size = struct.unpack_from("<H", header, 16)[0] + 1
+        raw_size = struct.unpack_from("<I", data, offset + size - 4)[0]
+        blocks.append(Block(offset, size, raw_offset, raw_size))
+        offset += size
+        raw_offset += raw_size
+    return blocks
+
+
+def _seekable_zstd_blocks(data: bytes) -> Optional[List[Block]]:
+    # Formato "seekable" de zstd: una tabla con el tamaño de cada frame, guardada en un
+    # frame omitible al final del archivo
+    if len(data) < 17 or struct.unpack_from("<I", data, len(data) - 4)[0] != _SEEKABLE_MAGIC:
+        return None
+    frames, descriptor = struct.unpack_from("<IB", data, len(data) - 9)
+    entry_size = 12 if descriptor & 0x80 else 8
+    table_start = len(data) - 9 - frames * entry_size
+    if table_start < 8 or struct.unpack_from("<I", data, table_start - 8)[0] != _SKIPPABLE_MAGIC:
+        return None
+
+    blocks = []
+    offset = raw_offset = 0
+    for index in range(frames):
+        size, raw_size = struct.unpack_from("<II", data, table_start + index * entry_size)
+        blocks.append(Block(offset, size, raw_offset, raw_size))
+        offset += size
+        raw_offset += raw_size
+    return blocks
+
+
+@lru_cache(maxsize=16)
+def _cached_blocks(file_path: str, size: int, mtime_ns: int) -> Optional[Tuple[Block, ...]]:
+    if size == 0:
+        return None
+    with open(file_path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        blocks = _bgzf_blocks(mapped) if file_path.endswith(".gz") else _seekable_zstd_blocks(mapped)
+    return tuple(blocks) if blocks else None
+
+
+def compressed_blocks(file_path: str) -> Optional[Tuple[Block, ...]]:
+    """
+    Devuelve los bloques independientes de un archivo comprimido, si su formato los tiene.
+
+    Los archivos BGZF (bgzip) y zstd "seekable" están formados por bloques que se pueden
+    descomprimir por separado, lo que permite repartirlos entre procesos. Un gzip o zstd
+    común solo se puede leer de principio a fin.
+
+    Args:
+        file_path (str): La ruta al archivo comprimido.
+
+    Returns:
+        Optional[Tuple[Block, ...]]: Los bloques en orden, o None si el archivo no es divisible.
+    """
+    stat = os.stat(file_path)
+    return _cached_blocks(file_path, stat.st_size, stat.st_mtime_ns)
+
+
+def _block_decompressor(file_path: str) -> Callable[[bytes, int], bytes]:
+    # Devuelve la función que descomprime un bloque dado su tamaño descomprimido
+    if file_path.endswith(".gz"):
+        return lambda data, raw_size: zlib.decompress(data, 31)
+    _require_zstandard()
+    decompressor = zstandard.ZstdDecompressor()
+    return lambda data, raw_size: decompressor.decompress(data, max_output_size=raw_size)
+
+
+def split_compressed(file_path: str, shards: int) -> List[Tuple[int, int]]:
+    """
+    Divide un archivo comprimido en rangos de bloques [inicio, fin) de tamaño comprimido parecido.
+
+    Args:
+        file_path (str): La ruta al archivo comprimido.
+        shards (int): Cantidad de rangos deseada.
+
+    Returns:
+        List[Tuple[int, int]]: Rangos contiguos de índices de bloques. Un archivo que no es
+                               divisible (ver `compressed_blocks`) forma un único rango.
+    """
+    blocks = compressed_blocks(file_path)
+    if blocks is None:
+        return [(0, 1)] if os.path.getsize(file_path) else []
+    total = blocks[-1].offset + blocks[-1].size
+    bounds = [0]
+    for i in range(1, shards):
+        target = total * i // shards
+        index = bounds[-1]
+        while index < len(blocks) and blocks[index].offset < target:
+            index += 1
+        bounds.append(index)
+    bounds.append(len(blocks))
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+
+def iter_compressed_lines(file_path: str, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Itera las líneas de un archivo comprimido que comienzan dentro de un rango de bloques.
+
+    Una línea pertenece al rango donde comienza: para saber si la primera línea del rango
+    comienza justo en su primer bloque se descomprime también el bloque anterior, y la última
+    línea se completa con los bloques siguientes. Así, los rangos de `split_compressed`
+    entregan cada línea exactamente una vez.
+
+    Args:
+        file_path (str): La ruta al archivo comprimido.
+        start (int): Índice del primer bloque del rango.
+        end (Optional[int]): Índice (exclusivo) del último bloque; por defecto, hasta el final.
+
+    Returns:
+        Iterator[bytes]: Las líneas no vacías del rango, sin el salto de línea.
+    """
+    blocks = compressed_blocks(file_path)
+    if blocks is None:
+        # Sin bloques independientes el archivo se lee en un solo flujo
+        with open(file_path, "rb") as file:
+            yield from (line for line in iter_stream_lines(open_decompressed(file, file_path)) if line.strip())
+        return
+    decompress = _block_decompressor(file_path)
+    end = len(blocks) if end is None else min(end, len(blocks))
+    if start >= end:
+        return
+    raw_start, raw_end = blocks[start].raw_offset, blocks[end - 1].raw_offset + blocks[end - 1].raw_size
+    first = max(start - 1, 0)
+    position = blocks[first].raw_offset  # Posición (descomprimida) del inicio de la línea actual
+    pending = b""
+    with open(file_path, "rb") as file:
+        for block in blocks[first:]:
+            file.seek(block.offset)
+            lines = (pending + decompress(file.read(block.size), block.raw_size)).split(b"\n")
+            pending = lines.pop()
+            for line in lines:
+                if position >= raw_end:
+                    return
+                if position >= raw_start and line.strip():
+                    yield line
+                position += len(line) + 1
+    if pending.strip() and raw_start <= position < raw_end:
+        yield pending
+
+
+# ========================
+# Escritura por bloques
+# ========================
+
+def _bgzf_block(data: bytes) -> bytes:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+    deflated = compressor.compress(data) + compressor.flush()
+    header = struct.pack("<4BI2BH2BHH", 0x1F, 0x8B, 8, 4, 0, 0, 0xFF, 6, ord("B"), ord("C"), 2,
+                         len(deflated) + 25)
+    return header + deflated + struct.pack("<II", zlib.crc32(data), len(data))
+
+
+def write_blocked(input_path: str, output_path: str, block_size: Optional[int] = None) -> None:
+    """
+    Comprime un archivo en un formato divisible en bloques: BGZF si la salida termina en .gz
+    o zstd "seekable" si termina en .zst. Ambos se leen también con gzip/zstd comunes.
+
+    Args:
+        input_path (str): Archivo a comprimir.
+        output_path (str): Archivo comprimido a escribir.
+        block_size (Optional[int]): Bytes descomprimidos por bloque.
+    """
+    zstd = output_path.endswith(".zst")
+    if zstd:
+        _require_zstandard()
+        compressor = zstandard.ZstdCompressor(level=3)
+    block_size = block_size or (ZSTD_FRAME_SIZE if zstd else BGZF_BLOCK_SIZE)
+
+    entries = []
+    with open(input_path, "rb") as source, open(output_path, "wb") as output:
+        while True:
+            data = source.read(block_size)
+            if not data:
+                break
+            block = compressor.compress(data) if zstd else _bgzf_block(data)
+            output.write(block)
+            entries.append((len(block), len(data)))
+        if zstd:
+            table = b"".join(struct.pack("<II", size, raw_size) for size, raw_size in entries)
+            table += struct.pack("<IBI", len(entries), 0, _SEEKABLE_MAGIC)
+            output.write(struct.pack("<II", _SKIPPABLE_MAGIC, len(table)) + table)
+        else:
+            output.write(_bgzf_block(b""))  # Bloque vacío que marca el fin del archivo
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Comprime un archivo de tweets en bloques (BGZF o zstd seekable).")
+    parser.add_argument("input_path")
+    parser.add_argument("output_path", help="Ruta de salida terminada en .gz o .zst")
+    parser.add_argument("--block-size", type=int)
+    args = parser.parse_args()
+    write_blocked(args.input_path, args.output_path, args.block_size)
@@ -0,0 +1,184 @@
+from typing import Iterator, Optional, Tuple, Union
+from datetime import date
+from array import array
+import json
+import os
+import shutil
+import sys
+import numpy as np
+from utils import VALIDATORS, day_ordinal
+from projection import tweet_loader
+from readers import iter_lines_at, iter_spans
+from column_cache import file_hash
+from compressed import is_compressed
+
+
+# Versión del formato; si cambia, los índices anteriores se reconstruyen
+INDEX_VERSION = 1
+INDEX_SUFFIX = ".dateidx"
+
+
+# ========================
+# Índice por fecha
+# ========================
+
+def parse_day(value: Union[date, str]) -> date:
+    """
+    Convierte una fecha (date o texto "YYYY-MM-DD") en date.
+    """
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+class DateIndex:
+    """
+    Posición de cada línea de un archivo de tweets agrupada por la fecha del tweet.
+
+    La fecha es la misma que usa q1 (la fecha local del campo date). Para cada día se guardan
+    el inicio y el fin en bytes de sus líneas, en orden del archivo.
+
+    Attributes:
+        days (np.ndarray): Ordinales de los días presentes, ordenados.
+        bounds (np.ndarray): Para el día i, sus líneas son starts[bounds[i]:bounds[i + 1]].
+        starts (np.ndarray): Byte inicial de cada línea indexada.
+        stops (np.ndarray): Byte final (exclusivo) de cada línea indexada.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.days = np.load(os.path.join(path, "days.npy"))
+        self.bounds = np.load(os.path.join(path, "bounds.npy"))
+        self.starts = np.load(os.path.join(path, "starts.npy"), mmap_mode="r")
+        self.stops = np.load(os.path.join(path, "stops.npy"), mmap_mode="r")
+
+    def spans(self, first: date, last: date) -> Iterator[Tuple[int, int]]:
+        """
+        Devuelve los rangos de bytes de las líneas con fecha entre first y last (inclusive),
+        en el orden del archivo.
+        """
+        lo, hi = np.searchsorted(self.days, [first.toordinal(), last.toordinal() + 1])
+        selected = np.concatenate([np.arange(self.bounds[i], self.bounds[i + 1]) for i in range(lo, hi)] or [[]])
+        selected = selected.astype(np.int64)
+        starts, stops = self.starts[selected], self.stops[selected]
+        order = np.argsort(starts)
+        return zip(starts[order].tolist(), stops[order].tolist())
+
+
+def index_path(file_path: str) -> str:
+    """
+    Devuelve la ruta del índice por fecha asociado a un archivo de tweets.
+    """
+    return file_path + INDEX_SUFFIX
+
+
+def build_date_index(file_path: str) -> str:
+    """
+    Lee el archivo de tweets una vez y escribe junto a él un índice con la posición de las
+    líneas de cada día.
+
+    Solo se indexan las líneas con una fecha válida (el mismo chequeo que FieldValidator);
+    el resto de los campos se valida al consultar.
+
+    Args:
+        file_path (str): La ruta al archivo JSON que contiene los tweets (sin comprimir).
+
+    Returns:
+        str: La ruta del directorio del índice.
+    """
+    if is_compressed(file_path):
+        raise ValueError("El índice por fecha requiere un archivo sin comprimir")
+    path = index_path(file_path)
+    tmp_path = path + ".tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    loads = tweet_loader()
+    check_date = VALIDATORS["fast"](("date",))
+    stat = os.stat(file_path)
+    days, starts, stops = array("i"), array("q"), array("q")
+    for start, line in iter_lines_at(file_path):
+        tweet = loads(line)
+        if not check_date(tweet):
+            continue
+        days.append(day_ordinal(tweet["date"]))
+        starts.append(start)
+        stops.append(start + len(line))
+
+    # Agrupar por día conservando el orden del archivo dentro de cada día
+    days = np.frombuffer(days, dtype=np.int32)
+    order = np.argsort(days, kind="stable")
+    unique_days, counts = np.unique(days, return_counts=True)
+    np.save(os.path.join(tmp_path, "days.npy"), unique_days)
+    np.save(os.path.join(tmp_path, "bounds.npy"), np.concatenate([[0], np.cumsum(counts)]).astype(np.int64))
+    np.save(os.path.join(tmp_path, "starts.npy"), np.frombuffer(starts, dtype=np.int64)[order])
+    np.save(os.path.join(tmp_path, "stops.npy"), np.frombuffer(stops, dtype=np.int64)[order])
+
+    meta = {
+        "version": INDEX_VERSION,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "hash": file_hash(file_path),
+        "lines": len(order),
+    }
+    with open(os.path.join(tmp_path, "meta.json"), "w") as file:
+        json.dump(meta, file)
+
+    # Reemplazar el índice anterior solo cuando el nuevo está completo
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_date_index(file_path: str) -> Optional[DateIndex]:
+    """
+    Carga el índice por fecha de un archivo si existe y corresponde a su contenido actual
+    (misma verificación que column_cache.load_column_cache).
+
+    Args:
+        file_path (str): La ruta al archivo JSON que contiene los tweets.
+
+    Returns:
+        Optional[DateIndex]: El índice, o None si no hay un índice válido.
+    """
+    path = index_path(file_path)
+    try:
+        with open(os.path.join(path, "meta.json")) as file:
+            meta = json.load(file)
+    except (OSError, ValueError):
+        return None
+
+    stat = os.stat(file_path)
+    if meta.get("version") != INDEX_VERSION or meta["size"] != stat.st_size:
+        return None
+    if meta["mtime_ns"] != stat.st_mtime_ns:
+        if meta["hash"] != file_hash(file_path):
+            return None
+        meta["mtime_ns"] = stat.st_mtime_ns
+        with open(os.path.join(path, "meta.json"), "w") as file:
+            json.dump(meta, file)
+    return DateIndex(path)
+
+
+def iter_lines_in_range(file_path: str, first: date, last: date) -> Iterator[memoryview]:
+    """
+    Itera, en el orden del archivo, solo las líneas con fecha entre first y last (inclusive).
+
+    Usa el índice del archivo; si no existe o está desactualizado, primero lo construye.
+
+    Args:
+        file_path (str): La ruta al archivo JSON que contiene los tweets (sin comprimir).
+        first (date): Primer día del rango.
+        last (date): Último día del rango.
+
+    Returns:
+        Iterator[memoryview]: Las líneas del rango.
+    """
+    index = load_date_index(file_path)
+    if index is None:
+        build_date_index(file_path)
+        index = load_date_index(file_path)
+    return iter_spans(file_path, index.spans(first, last))
+
+
+if __name__ == '__main__':
+    file_path = sys.argv[1] if len(sys.argv) > 1 else "src/data/farmers-protest-tweets-2021-2-4.json"
+    print(build_date_index(file_path))
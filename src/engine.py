@@ -0,0 +1,835 @@
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from datetime import date, datetime
+from collections import defaultdict, Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain, compress, islice
+from array import array
+import json
+import os
+import time
+import numpy as np
+from utils import VALIDATORS, day_ordinal, tweet_day
+from vectorized import top_days_by_user
+from heavy_hitters import SpaceSaving, TopKReport, top_items
+from projection import tweet_loader
+from readers import complete_end, iter_lines, next_line_start, map_file, split_file
+from compressed import is_compressed
+from instrumentation import recorder
+
+# Los extractores de q2 y q3 (extraction.py, con emoji y regex) y los módulos que solo usa la
+# lectura de archivos locales (column_cache, checkpoint, date_index) se importan donde se
+# usan por primera vez: una consulta solo de q1 en la Cloud Function no paga su importación
+if TYPE_CHECKING:
+    from column_cache import ColumnCache
+
+
+# ========================
+# Agregadores
+# ========================
+
+class DateUserAggregator:
+    """
+    Agregador de la pregunta 1: cuenta los tweets de cada usuario por fecha.
+
+    Además de los conteos, mantiene a medida que llegan los tweets el total de cada fecha y
+    su usuario líder, así que el top se elige con un heap sobre las fechas sin recorrer los
+    usuarios. Desempate determinístico (ver heavy_hitters.top_items): a igual total gana la
+    fecha más antigua y, dentro de una fecha, a igual conteo el nombre de usuario menor.
+
+    Attributes:
+        date_user_count (defaultdict): Contador de tweets por usuario para cada fecha.
+        date_total (Counter): Cantidad de tweets de cada fecha.
+        leaders (dict): Usuario líder de cada fecha, como (conteo, usuario).
+    """
+
+    name = "q1"
+    fields = ("date", "user.username")
+
+    def __init__(self):
+        self.date_user_count = defaultdict(Counter)
+        self.date_total = Counter()
+        self.leaders = {}
+
+    def add(self, tweet: dict) -> None:
+        self.add_day(tweet_day(tweet["date"]), tweet["user"]["username"])
+
+    def add_batch(self, tweets: List[dict]) -> None:
+        # Igual que add_day por cada tweet, sin el costo de una llamada por tweet. La fecha ya
+        # fue validada: el día sale del caché por prefijo, sin volver a parsearla
+        date_user_count, date_total, leaders = self.date_user_count, self.date_total, self.leaders
+        for tweet in tweets:
+            date, username = tweet_day(tweet["date"]), tweet["user"]["username"]
+            user_count = date_user_count[date]
+            count = user_count[username] = user_count[username] + 1
+            date_total[date] += 1
+            leader = leaders.get(date)
+            if leader is None or count > leader[0] or (count == leader[0] and username < leader[1]):
+                leaders[date] = (count, username)
+
+    def add_day(self, date: datetime.date, username: str, count: int = 1) -> None:
+        user_count = self.date_user_count[date]
+        user_count[username] += count
+        self.date_total[date] += count
+        self._offer(date, username, user_count[username])
+
+    def merge(self, other: "DateUserAggregator") -> None:
+        for day, user_count in other.date_user_count.items():
+            for username, count in user_count.items():
+                self.add_day(day, username, count)
+
+    def top(self, n: int = 10) -> List[Tuple[datetime.date, str]]:
+        """
+        Devuelve las n fechas con más tweets y el usuario con más publicaciones en cada una.
+        """
+        return [(date, self.leaders[date][1]) for date, _ in top_items(self.date_total, n)]
+
+    def _offer(self, date: datetime.date, username: str, count: int) -> None:
+        # Los conteos solo crecen, así que basta con comparar al usuario que cambió con el líder
+        leader = self.leaders.get(date)
+        if leader is None or count > leader[0] or (count == leader[0] and username < leader[1]):
+            self.leaders[date] = (count, username)
+
+
+class EncodedDateUserAggregator(DateUserAggregator):
+    """
+    Variante de q1 que guarda las fechas como ordinales y los usuarios como ids enteros
+    en arreglos compactos, y calcula el top con NumPy (ver vectorized.top_days_by_user).
+
+    Attributes:
+        days (array): Ordinal de la fecha de cada tweet.
+        users (array): Id del usuario de cada tweet.
+        user_ids (dict): Tabla de internación de nombres de usuario a ids, en orden de aparición.
+    """
+
+    def __init__(self):
+        self.days = array("i")
+        self.users = array("i")
+        self.user_ids = {}
+
+    @classmethod
+    def from_columns(cls, columns: "ColumnCache") -> "EncodedDateUserAggregator":
+        aggregator = cls()
+        aggregator.days.frombytes(np.ascontiguousarray(columns.day, dtype=np.int32).tobytes())
+        aggregator.users.frombytes(np.ascontiguousarray(columns.user, dtype=np.int32).tobytes())
+        aggregator.user_ids = {username: index for index, username in enumerate(columns.usernames)}
+        return aggregator
+
+    def add(self, tweet: dict) -> None:
+        self.days.append(day_ordinal(tweet["date"]))
+        self.users.append(self.user_ids.setdefault(tweet["user"]["username"], len(self.user_ids)))
+
+    def add_batch(self, tweets: List[dict]) -> None:
+        for tweet in tweets:
+            self.add(tweet)
+
+    def add_day(self, date: datetime.date, username: str, count: int = 1) -> None:
+        self.days.extend(array("i", [date.toordinal()]) * count)
+        self.users.extend(array("i", [self.user_ids.setdefault(username, len(self.user_ids))]) * count)
+
+    def merge(self, other: "EncodedDateUserAggregator") -> None:
+        remap = np.array([self.user_ids.setdefault(username, len(self.user_ids)) for username in other.user_ids],
+                         dtype=np.int32)
+        self.days.extend(other.days)
+        if len(other.users):
+            self.users.frombytes(remap[np.frombuffer(other.users, dtype=np.int32)].tobytes())
+
+    def top(self, n: int = 10) -> List[Tuple[datetime.date, str]]:
+        """
+        Devuelve las n fechas con más tweets y el usuario con más publicaciones en cada una.
+        """
+        usernames = list(self.user_ids)
+        top = top_days_by_user(np.frombuffer(self.days, dtype=np.int32), np.frombuffer(self.users, dtype=np.int32), n,
+                               user_key=usernames.__getitem__)
+        return [(date.fromordinal(day), usernames[user]) for day, user in top]
+
+
+class CompactDateUserAggregator(DateUserAggregator):
+    """
+    Variante de q1 con memoria proporcional a los pares (fecha, usuario) distintos.
+
+    Cada nombre de usuario se guarda una sola vez en una tabla de internación global y cada
+    tweet agrega a un registro pendiente una llave entera (ordinal del día << 32 | id del
+    usuario). Cada COMPACT_EVERY tweets el registro se compacta con NumPy en dos arreglos
+    uint32 por día, los ids de usuario ordenados y sus conteos: 8 bytes por par en lugar de
+    una entrada de Counter con su propio str por usuario y por día. Solo se copian los
+    arreglos de los días que recibieron tweets.
+
+    Al compactar se actualizan el total y el usuario líder de esos días, con el mismo
+    desempate que DateUserAggregator, así que el top se elige con un heap sobre los días.
+
+    Attributes:
+        user_ids (dict): Tabla de internación de nombres de usuario a ids, en orden de aparición.
+        usernames (List[str]): Nombre de cada id de usuario.
+        day_users (Dict[int, np.ndarray]): Ids de usuario (ordenados) de cada día, por ordinal.
+        day_counts (Dict[int, np.ndarray]): Cantidad de tweets de cada usuario de `day_users`.
+        day_total (Counter): Cantidad de tweets de cada día, hasta la última compactación.
+        leaders (dict): Usuario líder de cada día, hasta la última compactación.
+    """
+
+    # Tweets que se acumulan en el registro pendiente (8 bytes cada uno) antes de compactar
+    COMPACT_EVERY = 1 << 18
+
+    def __init__(self):
+        self.user_ids = {}
+        self.usernames = []
+        self.day_users = {}
+        self.day_counts = {}
+        self.day_total = Counter()
+        self.leaders = {}
+        self._pending = array("q")
+
+    @classmethod
+    def from_columns(cls, columns: "ColumnCache") -> "CompactDateUserAggregator":
+        aggregator = cls()
+        aggregator.usernames = list(columns.usernames)
+        aggregator.user_ids = {username: index for index, username in enumerate(aggregator.usernames)}
+        keys = np.left_shift(np.asarray(columns.day, dtype=np.int64), 32) | np.asarray(columns.user, dtype=np.int64)
+        aggregator._fold(*np.unique(keys, return_counts=True))
+        return aggregator
+
+    def add(self, tweet: dict) -> None:
+        self.add_day(tweet_day(tweet["date"]), tweet["user"]["username"])
+
+    def add_batch(self, tweets: List[dict]) -> None:
+        user_ids, usernames, pending = self.user_ids, self.usernames, self._pending
+        for tweet in tweets:
+            username = tweet["user"]["username"]
+            user = user_ids.get(username)
+            if user is None:
+                user = user_ids[username] = len(usernames)
+                usernames.append(username)
+            pending.append(day_ordinal(tweet["date"]) << 32 | user)
+        if len(pending) >= self.COMPACT_EVERY:
+            self._compact()
+
+    def add_day(self, date: datetime.date, username: str, count: int = 1) -> None:
+        user = self._intern(username)
+        if count != 1:
+            # Un conteo mayor se suma directo a los arreglos del día, sin pasar por el registro
+            self._fold_day(date.toordinal(), np.array([user], dtype=np.uint32), np.array([count], dtype=np.uint32))
+            return
+        self._pending.append(date.toordinal() << 32 | user)
+        if len(self._pending) >= self.COMPACT_EVERY:
+            self._compact()
+
+    def merge(self, other: "CompactDateUserAggregator") -> None:
+        other._compact()
+        remap = np.array([self._intern(username) for username in other.usernames], dtype=np.uint32)
+        for day, users in other.day_users.items():
+            users = remap[users]
+            order = np.argsort(users)
+            self._fold_day(day, users[order], other.day_counts[day][order])
+
+    def top(self, n: int = 10) -> List[Tuple[datetime.date, str]]:
+        """
+        Devuelve las n fechas con más tweets y el usuario con más publicaciones en cada una.
+        """
+        self._compact()
+        return [(date.fromordinal(day), self.leaders[day]) for day, _ in top_items(self.day_total, n)]
+
+    def _intern(self, username: str) -> int:
+        user = self.user_ids.get(username)
+        if user is None:
+            user = self.user_ids[username] = len(self.usernames)
+            self.usernames.append(username)
+        return user
+
+    def _compact(self) -> None:
+        if self._pending:
+            keys, counts = np.unique(np.frombuffer(self._pending, dtype=np.int64), return_counts=True)
+            self._pending = array("q")
+            self._fold(keys, counts)
+
+    def _fold(self, keys: np.ndarray, counts: np.ndarray) -> None:
+        # Reparte llaves únicas y ordenadas entre sus días
+        days, starts = np.unique(keys >> 32, return_index=True)
+        users = (keys & 0xFFFFFFFF).astype(np.uint32)
+        counts = counts.astype(np.uint32)
+        for day, start, stop in zip(days.tolist(), starts.tolist(), starts[1:].tolist() + [len(keys)]):
+            self._fold_day(day, users[start:stop], counts[start:stop])
+
+    def _fold_day(self, day: int, users: np.ndarray, counts: np.ndarray) -> None:
+        # Suma los conteos de usuarios únicos y ordenados a los de un día y actualiza su
+        # total y su líder
+        day_users = self.day_users.get(day)
+        if day_users is None:
+            day_users, day_counts = users.copy(), counts.copy()
+        else:
+            day_counts = self.day_counts[day]
+            position = np.searchsorted(day_users, users)
+            found = position < len(day_users)
+            found[found] = day_users[position[found]] == users[found]
+            day_counts[position[found]] += counts[found]
+            day_users = np.insert(day_users, position[~found], users[~found])
+            day_counts = np.insert(day_counts, position[~found], counts[~found])
+        self.day_users[day], self.day_counts[day] = day_users, day_counts
+        self.day_total[day] += int(counts.sum())
+        tied = day_users[day_counts == day_counts.max()]
+        self.leaders[day] = min(self.usernames[user] for user in tied.tolist())
+
+
+class EmojiAggregator:
+    """
+    Agregador de la pregunta 2: cuenta los emojis usados en el contenido de los tweets.
+
+    Attributes:
+        emoji_count (Counter): Contador de apariciones por emoji.
+    """
+
+    name = "q2"
+    fields = ("content",)
+
+    def __init__(self):
+        self.emoji_count = Counter()
+
+    def add(self, tweet: dict) -> None:
+        self.add_content(tweet.get("content") or "")
+
+    def add_content(self, content: str) -> None:
+        from extraction import extract_emojis, emoji_pattern
+        self.emoji_count.update(extract_emojis(content, emoji_pattern))
+
+    def add_batch(self, tweets: List[dict]) -> None:
+        from extraction import extract_emojis, emoji_pattern
+        self.emoji_count.update(chain.from_iterable(extract_emojis(tweet.get("content") or "", emoji_pattern) for tweet in tweets))
+
+    def add_encoded(self, ids: np.ndarray, emojis: List[str]) -> None:
+        # Emojis ya extraídos y codificados con diccionario (ver column_cache.py)
+        counts = np.bincount(ids, minlength=len(emojis))
+        present = np.flatnonzero(counts)
+        self.emoji_count.update(dict(zip([emojis[index] for index in present.tolist()], counts[present].tolist())))
+
+    def merge(self, other: "EmojiAggregator") -> None:
+        self.emoji_count.update(other.emoji_count)
+
+    def top(self, n: int = 10) -> List[Tuple[str, int]]:
+        """
+        Devuelve los n emojis más usados con su conteo (a igual conteo, primero el emoji
+        menor; ver heavy_hitters.top_items).
+        """
+        return top_items(self.emoji_count, n)
+
+
+class MentionAggregator:
+    """
+    Agregador de la pregunta 3: cuenta las menciones (@) a cada usuario.
+
+    Attributes:
+        mention_count (Counter): Contador de menciones por usuario.
+    """
+
+    name = "q3"
+    fields = ("content",)
+
+    def __init__(self):
+        self.mention_count = Counter()
+
+    def add(self, tweet: dict) -> None:
+        self.add_content(tweet.get("content") or "")
+
+    def add_content(self, content: str) -> None:
+        from extraction import extract_mentions, mention_pattern
+        self.mention_count.update(extract_mentions(content, mention_pattern))
+
+    def add_batch(self, tweets: List[dict]) -> None:
+        from extraction import extract_mentions, mention_pattern
+        self.mention_count.update(chain.from_iterable(extract_mentions(tweet.get("content") or "", mention_pattern) for tweet in tweets))
+
+    def add_encoded(self, ids: np.ndarray, mentions: List[str]) -> None:
+        # Menciones ya extraídas y codificadas con diccionario (ver column_cache.py)
+        counts = np.bincount(ids, minlength=len(mentions))
+        present = np.flatnonzero(counts)
+        self.mention_count.update(dict(zip([mentions[index] for index in present.tolist()], counts[present].tolist())))
+
+    def merge(self, other: "MentionAggregator") -> None:
+        self.mention_count.update(other.mention_count)
+
+    def top(self, n: int = 10) -> List[Tuple[str, int]]:
+        """
+        Devuelve los n usuarios más mencionados con su conteo (a igual conteo, primero el
+        nombre menor; ver heavy_hitters.top_items).
+        """
+        return top_items(self.mention_count, n)
+
+
+class ApproximateEmojiAggregator(EmojiAggregator):
+    """
+    Variante de q2 con memoria acotada: cuenta los emojis con un resumen Space-Saving
+    cuyo error máximo es approx_error veces el total de emojis.
+    """
+
+    def __init__(self, approx_error: float):
+        self.emoji_count = SpaceSaving.from_error(approx_error)
+
+    def add_encoded(self, ids: np.ndarray, emojis: List[str]) -> None:
+        # El resumen depende del orden de llegada: se recorren en el orden del archivo
+        self.emoji_count.update(map(emojis.__getitem__, ids.tolist()))
+
+    def merge(self, other: "ApproximateEmojiAggregator") -> None:
+        self.emoji_count.merge(other.emoji_count)
+
+    def top(self, n: int = 10) -> List[Tuple[str, int]]:
+        return self.emoji_count.most_common(n)
+
+    def report(self, n: int = 10) -> TopKReport:
+        """
+        Devuelve el top-n de emojis junto con sus garantías de error.
+        """
+        return self.emoji_count.report(n)
+
+
+class ApproximateMentionAggregator(MentionAggregator):
+    """
+    Variante de q3 con memoria acotada: cuenta las menciones con un resumen Space-Saving
+    cuyo error máximo es approx_error veces el total de menciones.
+    """
+
+    def __init__(self, approx_error: float):
+        self.mention_count = SpaceSaving.from_error(approx_error)
+
+    def add_encoded(self, ids: np.ndarray, mentions: List[str]) -> None:
+        # El resumen depende del orden de llegada: se recorren en el orden del archivo
+        self.mention_count.update(map(mentions.__getitem__, ids.tolist()))
+
+    def merge(self, other: "ApproximateMentionAggregator") -> None:
+        self.mention_count.merge(other.mention_count)
+
+    def top(self, n: int = 10) -> List[Tuple[str, int]]:
+        return self.mention_count.most_common(n)
+
+    def report(self, n: int = 10) -> TopKReport:
+        """
+        Devuelve el top-n de usuarios mencionados junto con sus garantías de error.
+        """
+        return self.mention_count.report(n)
+
+
+AGGREGATORS = {
+    DateUserAggregator.name: DateUserAggregator,
+    EmojiAggregator.name: EmojiAggregator,
+    MentionAggregator.name: MentionAggregator,
+}
+
+# Implementaciones disponibles para la agregación de q1
+Q1_BACKENDS = {
+    "compact": CompactDateUserAggregator,
+    "dict": DateUserAggregator,
+    "numpy": EncodedDateUserAggregator,
+}
+
+
+def new_result(validation: str = "fast", backend: str = "compact", approx_error: Optional[float] = None,
+               dead_letter: Optional[str] = None) -> Dict[str, object]:
+    """
+    Crea los agregadores vacíos de q1, q2 y q3 junto con su validador.
+
+    Args:
+        validation (str): "fast" revisa solo los campos que leen las consultas;
+                          "full" construye el TweetModel completo.
+        backend (str): Implementación de q1: "compact" (tabla de usuarios y conteos por
+                       par en arreglos), "dict" (defaultdict de Counter) o "numpy"
+                       (columnas de enteros agregadas con NumPy).
+        approx_error (Optional[float]): Si se entrega, q2 y q3 usan un top-k aproximado
+                                        de memoria fija con este error relativo máximo.
+        dead_letter (Optional[str]): Archivo al que el validador agrega las líneas rechazadas.
+
+    Returns:
+        Dict[str, object]: Agregadores por pregunta y el validador en la llave "validation".
+    """
+    result = {name: aggregator() for name, aggregator in AGGREGATORS.items()}
+    result["q1"] = Q1_BACKENDS[backend]()
+    if approx_error is not None:
+        result["q2"] = ApproximateEmojiAggregator(approx_error)
+        result["q3"] = ApproximateMentionAggregator(approx_error)
+    fields = dict.fromkeys(field for aggregator in AGGREGATORS.values() for field in aggregator.fields)
+    result["validation"] = VALIDATORS[validation](fields, dead_letter)
+    return result
+
+
+# ========================
+# Motor de una sola pasada
+# ========================
+
+# Bytes con los que puede empezar una línea en blanco
+_BLANK = frozenset(b" \t\r\n")
+
+# Cantidad de líneas que se decodifican, validan y agregan juntas
+BATCH_SIZE = 4096
+
+def process_lines(lines: Iterable, aggregators: Iterable, validator: Callable[[dict], bool],
+                  batch_size: int = BATCH_SIZE) -> None:
+    """
+    Parsea y valida cada línea una única vez y envía los tweets válidos a todos los agregadores.
+
+    Las líneas se procesan por lotes de `batch_size`: primero se decodifica el lote, luego se
+    valida y al final cada agregador recibe la lista de tweets válidos (`add_batch`). Solo un
+    lote está en memoria a la vez, así que el pico de memoria no depende del tamaño del archivo.
+
+    Si el validador no necesita el tweet completo, cada línea se parsea proyectando solo
+    los campos que leen las consultas (ver projection.tweet_loader).
+
+    Los tweets inválidos no se imprimen: el validador los cuenta y recibe juntas las líneas
+    rechazadas de cada lote (ver utils.FieldValidator), así que un lote sin rechazos no
+    paga nada extra. Una línea que no es JSON válido, como la última a medio escribir de un
+    archivo que crece, se rechaza igual, con el error ("tweet", "json"), sin cortar la lectura.
+
+    Args:
+        lines (Iterable): Líneas JSON (bytes o memoryview), una por tweet.
+        aggregators (Iterable): Agregadores que recibirán cada tweet válido.
+        validator (Callable[[dict], bool]): Validador del esquema del tweet.
+        batch_size (int): Cantidad de líneas por lote.
+    """
+    aggregators = list(aggregators)
+    loads = tweet_loader(validator.full_tweet)
+    lines = iter(lines)
+    if recorder.enabled:
+        return _process_lines_measured(lines, aggregators, validator, loads, batch_size)
+    while True:
+        batch = list(islice(lines, batch_size))
+        if not batch:
+            break
+        batch = [line for line in batch if line and (line[0] not in _BLANK or bytes(line).strip())]
+        tweets = _validate(validator, batch, [loads(line) for line in batch])  # Validar el esquema del tweet
+        del batch
+        for aggregator in aggregators:
+            aggregator.add_batch(tweets)
+    validator.log.flush()
+
+
+def _validate(validator: Callable[[dict], bool], lines: List, tweets: List[dict]) -> List[dict]:
+    # Devuelve los tweets válidos del lote. Solo si hubo rechazos se arman las listas de
+    # líneas rechazadas, que se entregan juntas al validador (ejemplos y archivo de descarte)
+    flags = [validator(tweet) for tweet in tweets]
+    if all(flags):
+        return tweets
+    validator.reject([line for line, valid in zip(lines, flags) if not valid],
+                     [tweet for tweet, valid in zip(tweets, flags) if not valid])
+    return list(compress(tweets, flags))
+
+
+def _process_lines_measured(lines: Iterator, aggregators: List, validator: Callable[[dict], bool],
+                            loads: Callable, batch_size: int) -> None:
+    # Igual que process_lines, pero mide cada etapa por lote (ver instrumentation.py). La
+    # etapa de q1 incluye el parseo de fechas; las de q2 y q3, la extracción de emojis y menciones.
+    clock = time.perf_counter
+    while True:
+        start = clock()
+        batch = list(islice(lines, batch_size))
+        read = clock()
+        if not batch:
+            recorder.add_times(read=read - start)
+            break
+        batch = [line for line in batch if line and (line[0] not in _BLANK or bytes(line).strip())]
+        tweets = [loads(line) for line in batch]
+        parsed = clock()
+        valid = _validate(validator, batch, tweets)
+        del batch
+        validated = clock()
+        times = {"read": read - start, "parse": parsed - read, "validate": validated - parsed}
+        for aggregator in aggregators:
+            aggregate_start = clock()
+            aggregator.add_batch(valid)
+            times["aggregate." + aggregator.name] = clock() - aggregate_start
+        recorder.add_times(**times)
+        recorder.add_counts(lines=len(tweets), valid=len(valid))
+        recorder.sample_memory()
+    validator.log.flush()
+
+
+def analyze_range(file_path: str, start: int = 0, end: Optional[int] = None, **config) -> Dict[str, object]:
+    """
+    Calcula los agregados parciales de q1, q2 y q3 para un rango de bytes del archivo.
+
+    Args:
+        file_path (str): La ruta al archivo JSON que contiene los tweets.
+        start (int): Byte inicial del rango, al comienzo de una línea (en un archivo
+                     comprimido, índice de bloque; ver readers.split_file).
+        end (Optional[int]): Fin (exclusivo) del rango; por defecto, el fin del archivo.
+        **config: Configuración de los agregadores (ver `new_result`).
+
+    Returns:
+        Dict[str, object]: Agregadores parciales indexados por pregunta.
+    """
+    result = new_result(**config)
+    aggregators = [result[name] for name in AGGREGATORS]
+    process_lines(iter_lines(file_path, start, end), aggregators, result["validation"])
+    return result
+
+
+def merge_results(partials: Iterable[Dict[str, object]], **config) -> Dict[str, object]:
+    """
+    Combina agregados parciales en el orden de sus rangos.
+
+    Los empates del top se resuelven por llave (ver heavy_hitters.top_items), así que el
+    resultado es el mismo que en la ejecución serial sin importar cómo se dividió el
+    archivo. El orden solo importa para los ejemplos de tweets rechazados, que conservan
+    los primeros del archivo.
+    """
+    merged = new_result(**config)
+    for partial_result in partials:
+        for name, aggregator in partial_result.items():
+            merged[name].merge(aggregator)
+    return merged
+
+
+def _analyze_parallel(file_path: str, workers: int, **config) -> Dict[str, object]:
+    ranges = split_file(file_path, workers)
+    if len(ranges) <= 1:
+        return analyze_range(file_path, **config)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        starts, ends = zip(*ranges)
+        if not recorder.enabled:
+            task = partial(analyze_range, file_path, **config)
+            return merge_results(executor.map(task, starts, ends), **config)
+        # Con métricas, cada proceso devuelve también lo que registró
+        task = partial(_analyze_range_measured, file_path, **config)
+        partials = []
+        for result, snapshot in executor.map(task, starts, ends):
+            recorder.merge(snapshot)
+            partials.append(result)
+        return merge_results(partials, **config)
+
+
+def _analyze_range_measured(file_path: str, start: int, end: int, **config) -> Tuple[Dict[str, object], dict]:
+    recorder.enable()
+    recorder.reset()
+    result = analyze_range(file_path, start, end, **config)
+    recorder.sample_memory(force=True)
+    return result, recorder.snapshot()
+
+
+def analyze_columns(columns: "ColumnCache", **config) -> Dict[str, object]:
+    """
+    Calcula los agregados de q1, q2 y q3 a partir del caché columnar, sin parsear JSON.
+
+    Los emojis y las menciones se extrajeron al construir el caché, así que q2 y q3 solo
+    cuentan sus ids, sin volver a recorrer el contenido.
+
+    Args:
+        columns (ColumnCache): Columnas proyectadas del archivo (ver column_cache.py).
+        **config: Configuración de los agregadores (ver `new_result`). Con los backends
+                  "compact" y "numpy" las columnas de q1 se usan directamente, sin
+                  recorrerlas en Python.
+
+    Returns:
+        Dict[str, object]: Agregadores indexados por pregunta, igual que `analyze_range`.
+    """
+    result = new_result(**config)
+    validator = result["validation"]
+    validator.rejections.update(columns.rejections)
+    validator.errors.update(columns.errors)
+    validator.rejected += columns.rejected
+    validator.log.samples.extend(columns.samples)
+
+    if isinstance(result["q1"], (CompactDateUserAggregator, EncodedDateUserAggregator)):
+        result["q1"] = type(result["q1"]).from_columns(columns)
+    else:
+        dates = {}
+        usernames = columns.usernames
+        q1 = result["q1"]
+        for day, user in zip(columns.day.tolist(), columns.user.tolist()):
+            if day not in dates:
+                dates[day] = date.fromordinal(day)
+            q1.add_day(dates[day], usernames[user])
+
+    result["q2"].add_encoded(columns.emoji, columns.emojis)
+    result["q3"].add_encoded(columns.mention, columns.mentions)
+    return result
+
+
+def analyze_dates(file_path: str, first: date, last: date, **config) -> Dict[str, object]:
+    """
+    Calcula los agregados de q1, q2 y q3 solo con los tweets cuya fecha está entre first y
+    last (inclusive), leyendo únicamente sus líneas gracias al índice por fecha (ver
+    date_index.py). El costo es proporcional a los datos del rango y no al archivo completo.
+
+    Args:
+        file_path (str): La ruta al archivo JSON que contiene los tweets (sin comprimir).
+        first (date): Primer día del rango.
+        last (date): Último día del rango.
+        **config: Configuración de los agregadores (ver `new_result`).
+
+    Returns:
+        Dict[str, object]: Agregadores indexados por pregunta, igual que `analyze_range`. Los
+                           rechazos solo cuentan las líneas leídas; las líneas sin una fecha
+                           válida no pertenecen a ningún rango.
+    """
+    from date_index import iter_lines_in_range
+    result = new_result(**config)
+    aggregators = [result[name] for name in AGGREGATORS]
+    process_lines(iter_lines_in_range(file_path, first, last), aggregators, result["validation"])
+    return result
+
+
+# ========================
+# Procesamiento incremental
+# ========================
+
+# Cantidad de bytes procesados entre un checkpoint y el siguiente
+CHECKPOINT_EVERY = 64 * 1024 * 1024
+
+
+def analyze_incremental(file_path: str, checkpoint_path: str, checkpoint_every: int = CHECKPOINT_EVERY,
+                        **config) -> Dict[str, object]:
+    """
+    Calcula los agregados de q1, q2 y q3 retomando desde un checkpoint.
+
+    Si el checkpoint corresponde al archivo (que solo pudo crecer por el final) y a la misma
+    configuración, se procesan únicamente los bytes nuevos. Durante la lectura se guarda un
+    checkpoint cada `checkpoint_every` bytes, de modo que una ejecución interrumpida continúa
+    desde el último guardado. Solo se procesan líneas completas (terminadas en salto de línea).
+
+    Args:
+        file_path (str): La ruta al archivo JSON que contiene los tweets.
+        checkpoint_path (str): La ruta del archivo de checkpoint.
+        checkpoint_every (int): Bytes procesados entre checkpoints.
+        **config: Configuración de los agregadores (ver `new_result`).
+
+    Returns:
+        Dict[str, object]: Agregadores indexados por pregunta, igual que `analyze_range`.
+    """
+    from checkpoint import load_checkpoint, save_checkpoint
+    if is_compressed(file_path):
+        raise ValueError("El procesamiento incremental requiere un archivo sin comprimir")
+    state = load_checkpoint(checkpoint_path, file_path, config)
+    if state is None:
+        offset, result = 0, new_result(**config)
+    else:
+        offset, result = state["offset"], state["result"]
+
+    end = complete_end(file_path)
+    aggregators = [result[name] for name in AGGREGATORS]
+    while offset < end:
+        with map_file(file_path) as mapped:
+            stop = min(next_line_start(mapped, offset + checkpoint_every), end)
+        process_lines(iter_lines(file_path, offset, stop), aggregators, result["validation"])
+        offset = stop
+        save_checkpoint(checkpoint_path, file_path, offset, config, result)
+    return result
+
+
+_RESULTS_CACHE_SIZE = 4
+_results_cache = OrderedDict()
+
+
+def analyze_file(file_path: str, workers: Optional[int] = 1, validation: str = "fast",
+                 use_cache: bool = True, backend: str = "compact",
+                 approx_error: Optional[float] = None, checkpoint: Optional[str] = None,
+                 date_range: Optional[Tuple[Union[date, str], Union[date, str]]] = None,
+                 dead_letter: Optional[str] = None) -> Dict[str, object]:
+    """
+    Lee el archivo de tweets una sola vez y calcula los agregados de q1, q2 y q3.
+
+    El resultado se guarda en caché por ruta, tamaño y fecha de modificación, de modo
+    que llamar a varias funciones qN_* sobre el mismo archivo solo paga un parseo.
+
+    Args:
+        file_path (str): La ruta al archivo JSON que contiene los tweets.
+        workers (Optional[int]): Cantidad de procesos. Con más de uno, el archivo se divide
+                                 en rangos de bytes que se procesan en paralelo y luego se
+                                 combinan. None usa todos los núcleos disponibles.
+        validation (str): "fast" (por defecto) revisa solo date, user.username y content;
+                          "full" valida cada tweet con el TweetModel completo.
+        use_cache (bool): Si existe un caché columnar vigente junto al archivo (ver
+                          column_cache.build_column_cache), se calcula desde él sin
+                          volver a parsear el JSON.
+        backend (str): Implementación de q1: "compact" (por defecto) guarda cada usuario
+                       una vez y los conteos por (fecha, usuario) en arreglos de NumPy,
+                       con 8 bytes por par distinto; "dict" usa un Counter por
+                       fecha; "numpy" guarda fecha y usuario de cada tweet y cuenta con
+                       NumPy al final. Todas devuelven el mismo resultado.
+        approx_error (Optional[float]): Activa el top-k aproximado de q2 y q3 con memoria
+                                        fija (Space-Saving): ningún conteo se sobreestima
+                                        en más de approx_error veces el total. Sus
+                                        agregadores exponen `report(n)` con las garantías.
+        checkpoint (Optional[str]): Ruta de un archivo de checkpoint. Si se entrega, el estado
+                                    se guarda junto con el offset procesado y una nueva
+                                    ejecución solo lee lo agregado al final del archivo
+                                    (ver `analyze_incremental`). Se procesa en un solo proceso.
+        date_range (Optional[Tuple]): Días (date o "YYYY-MM-DD") inicial y final, inclusive.
+                                      Si se entrega, solo se leen las líneas de esos días
+                                      usando el índice por fecha del archivo, que se
+                                      construye la primera vez (ver `analyze_dates`).
+        dead_letter (Optional[str]): Archivo donde se escriben, en bloque, las líneas
+                                     rechazadas por la validación. Se vacía al comenzar
+                                     (salvo con checkpoint, donde se sigue agregando) y
+                                     obliga a leer el JSON aunque exista el caché columnar.
+                                     Con varios procesos las líneas quedan agrupadas por
+                                     rango, no en el orden del archivo.
+
+    Returns:
+        Dict[str, object]: Agregadores indexados por pregunta ("q1", "q2", "q3") y el
+                           validador en "validation", con los rechazos por campo en
+                           su atributo `rejections` y el resumen por tipo de error y los
+                           ejemplos en `summary()`. No deben modificarse, ya que se
+                           comparten entre llamadas.
+    """
+    from column_cache import load_column_cache
+    from date_index import parse_day
+    stat = os.stat(file_path)
+    # El tamaño y la fecha de modificación forman parte de la llave del caché,
+    # así un archivo modificado vuelve a procesarse.
+    config = {"validation": validation, "backend": backend, "approx_error": approx_error, "dead_letter": dead_letter}
+    if date_range is not None:
+        date_range = tuple(parse_day(day) for day in date_range)
+        if checkpoint is not None:
+            raise ValueError("date_range no se puede combinar con checkpoint")
+    key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns, checkpoint, date_range, *config.values())
+    if key in _results_cache:
+        _results_cache.move_to_end(key)
+        if recorder.enabled:
+            recorder.add_counts(results_cache_hits=1)
+        return _results_cache[key]
+
+    with recorder.recording("analyze_file", file_path=file_path, workers=workers, **config):
+        if dead_letter is not None and checkpoint is None:
+            open(dead_letter, "wb").close()
+        # Una consulta por rango de fechas lee solo sus líneas y no usa las columnas
+        use_cache = use_cache and checkpoint is None and dead_letter is None and date_range is None
+        columns = load_column_cache(key[0], validation) if use_cache else None
+        workers = workers or os.cpu_count() or 1
+        if date_range is not None:
+            result = analyze_dates(key[0], *date_range, **config)
+        elif checkpoint is not None:
+            result = analyze_incremental(key[0], checkpoint, **config)
+        elif columns is not None:
+            with recorder.timer("columns"):
+                result = analyze_columns(columns, **config)
+        elif workers > 1:
+            result = _analyze_parallel(key[0], workers, **config)
+        else:
+            result = analyze_range(key[0], **config)
+        if recorder.enabled:
+            recorder.add_counts(**{"rejected." + field: count for field, count in result["validation"].rejections.items()})
+
+    # Un solo resumen por archivo en lugar de un mensaje por tweet rechazado
+    if result["validation"].rejected:
+        print(f"Tweets rechazados: {result['validation'].rejected} "
+              f"{json.dumps(result['validation'].summary()['errors'])}")
+
+    _results_cache[key] = result
+    if len(_results_cache) > _RESULTS_CACHE_SIZE:
+        _results_cache.popitem(last=False)
+    return result
+
+
+def query(file_path: str, name: str, n: int = 10, **options) -> List[tuple]:
+    """
+    Devuelve el top-n de una pregunta ("q1", "q2" o "q3") para un archivo. Es lo que usan
+    las funciones qN_*; con las métricas activas (ver instrumentation.py) reporta además el
+    tiempo de cada etapa, incluido el ordenamiento final.
+
+    Args:
+        file_path (str): La ruta al archivo JSON que contiene los tweets.
+        name (str): La pregunta.
+        n (int): Cantidad de elementos del top.
+        **options: Opciones de `analyze_file`.
+
+    Returns:
+        List[tuple]: El top-n de la pregunta.
+    """
+    with recorder.recording(name, file_path=file_path, **options):
+        result = analyze_file(file_path, **options)
+        with recorder.timer("top"):
+            return result[name].top(n)
@@ -0,0 +1,56 @@
+from typing import List
+import emoji
+import regex
+
+
+# ========================
+# Extracción de Emojis
+# ========================
+
+# Caracteres de EMOJI_DATA que son emoji por sí solos, precalculados al importar
+EMOJI_CHARS = frozenset(key for key in emoji.EMOJI_DATA if len(key) == 1)
+
+# Clase de caracteres compilada con los mismos caracteres, para descartar textos sin emojis
+EMOJI_CHAR_PATTERN = regex.compile("[" + "".join(regex.escape(char) for char in sorted(EMOJI_CHARS)) + "]")
+
+# Expresiones de q2 (grafemas) y q3 (menciones), compartidas por el motor y el caché columnar
+emoji_pattern = regex.compile(r'\X')
+mention_pattern = regex.compile(r'@\w+')
+
+
+def extract_emojis(text, emoji_pattern):
+    """
+    Extrae todos los emojis de un texto dado utilizando una expresión regular,
+    excluyendo los modificadores de tono de piel.
+
+    Un grafema cuenta como emoji si contiene algún carácter de EMOJI_DATA, de modo que
+    las secuencias ZWJ y los tonos de piel se mantienen como un solo grafema. Los textos
+    ASCII o sin caracteres emoji se descartan sin separarlos en grafemas.
+
+    Args:
+        text (str): El texto del cual extraer emojis.
+
+    Returns:
+        List[str]: Una lista de emojis encontrados en el texto, sin los modificadores de tono de piel.
+    """
+    if text.isascii() or not EMOJI_CHAR_PATTERN.search(text):
+        return []
+    emojis = [word for word in emoji_pattern.findall(text) if not EMOJI_CHARS.isdisjoint(word)]
+    return emojis
+
+
+# ========================
+# Extracción de Menciones
+# ========================
+def extract_mentions(text: str, mention_pattern) -> List[str]:
+    """
+    Extrae todas las menciones (@) de un texto dado utilizando una expresión regular.
+    
+    Args:
+        text (str): El texto del cual extraer menciones.
+
+    Returns:
+        List[str]: Una lista de menciones encontradas en el texto.
+    """
+    mentions = mention_pattern.findall(text)
+    return [mention[1:] for mention in mentions] 
\ No newline at end of file
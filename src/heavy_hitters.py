@@ -0,0 +1,162 @@
+from typing import Dict, Hashable, Iterable, List, NamedTuple, Tuple
+import heapq
+import math
+
+
+def top_items(counts: Dict[Hashable, int], n: int = 10) -> List[Tuple[Hashable, int]]:
+    """
+    Selecciona con un heap los n pares (elemento, conteo) de mayor conteo.
+
+    Desempate determinístico: a igual conteo, primero el elemento menor (la fecha más
+    antigua, el texto menor). Así el top no depende del orden en que los datos se agregaron
+    o combinaron, y la ejecución serial, paralela, desde caché o en streaming da el mismo
+    resultado.
+
+    Args:
+        counts (Dict[Hashable, int]): Conteo por elemento (por ejemplo, un Counter).
+        n (int): Cantidad de elementos a devolver.
+
+    Returns:
+        List[Tuple[Hashable, int]]: Los pares, por conteo descendente y elemento ascendente.
+    """
+    return heapq.nsmallest(n, counts.items(), key=lambda item: (-item[1], item[0]))
+
+
+class TopKReport(NamedTuple):
+    """
+    Resultado aproximado del top-k junto con sus garantías de error.
+
+    Attributes:
+        items (List[Tuple[Hashable, int]]): Elementos y conteo estimado, como Counter.most_common.
+        errors (List[int]): Sobreestimación máxima del conteo de cada elemento de `items`.
+        error_bound (int): Cota global del error: ningún conteo se sobreestima en más de este
+                           valor, y todo elemento con más apariciones está en el resumen.
+        total (int): Cantidad total de apariciones procesadas.
+    """
+
+    items: List[Tuple[Hashable, int]]
+    errors: List[int]
+    error_bound: int
+    total: int
+
+
+class SpaceSaving:
+    """
+    Resumen Space-Saving (Metwally et al.) para encontrar los elementos más frecuentes
+    con memoria fija.
+
+    Guarda a lo sumo `capacity` contadores, sin importar cuántos elementos distintos haya.
+    Cada conteo estimado sobreestima el real en a lo sumo total / capacity, por lo que con
+    capacity = ceil(1 / epsilon) el error es como máximo epsilon * total.
+
+    Attributes:
+        capacity (int): Cantidad máxima de contadores.
+        counts (Dict[Hashable, int]): Conteo estimado por elemento monitoreado.
+        errors (Dict[Hashable, int]): Sobreestimación máxima de cada conteo.
+        total (int): Cantidad total de apariciones procesadas.
+    """
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.counts: Dict[Hashable, int] = {}
+        self.errors: Dict[Hashable, int] = {}
+        self.total = 0
+        # Elementos agrupados por conteo (en orden de llegada) y conteo mínimo actual
+        self._buckets: Dict[int, Dict[Hashable, None]] = {}
+        self._min = 0
+
+    @classmethod
+    def from_error(cls, epsilon: float) -> "SpaceSaving":
+        """
+        Crea un resumen cuyo error máximo es epsilon veces el total de apariciones.
+        """
+        if not 0 < epsilon <= 1:
+            raise ValueError("epsilon must be in (0, 1]")
+        return cls(math.ceil(1 / epsilon))
+
+    def _move(self, item: Hashable, old: int, new: int) -> None:
+        bucket = self._buckets[old]
+        del bucket[item]
+        if not bucket:
+            del self._buckets[old]
+            if old == self._min:
+                self._min = new
+        self._buckets.setdefault(new, {})[item] = None
+
+    def add(self, item: Hashable) -> None:
+        self.total += 1
+        count = self.counts.get(item)
+        if count is not None:
+            self.counts[item] = count + 1
+            self._move(item, count, count + 1)
+            return
+
+        if len(self.counts) < self.capacity:
+            self.counts[item] = 1
+            self.errors[item] = 0
+            self._buckets.setdefault(1, {})[item] = None
+            self._min = 1
+            return
+
+        # Reemplazar el elemento más antiguo entre los de menor conteo
+        minimum = self._min
+        bucket = self._buckets[minimum]
+        evicted = next(iter(bucket))
+        del bucket[evicted]
+        del self.counts[evicted]
+        del self.errors[evicted]
+        if not bucket:
+            del self._buckets[minimum]
+            self._min = minimum + 1
+        self.counts[item] = minimum + 1
+        self.errors[item] = minimum
+        self._buckets.setdefault(minimum + 1, {})[item] = None
+
+    def update(self, items: Iterable[Hashable]) -> None:
+        for item in items:
+            self.add(item)
+
+    def merge(self, other: "SpaceSaving") -> None:
+        """
+        Combina otro resumen en este (resúmenes combinables, Agarwal et al.).
+
+        Un elemento ausente en un resumen lleno puede haber aparecido hasta su conteo mínimo
+        de veces, así que ese mínimo se suma a su conteo y a su error. Luego se conservan los
+        `capacity` conteos más altos; el error global sigue acotado por total / capacity.
+        """
+        self_min = self._min if len(self.counts) >= self.capacity else 0
+        other_min = other._min if len(other.counts) >= other.capacity else 0
+
+        counts, errors = {}, {}
+        for item in list(self.counts) + [item for item in other.counts if item not in self.counts]:
+            counts[item] = self.counts.get(item, self_min) + other.counts.get(item, other_min)
+            errors[item] = self.errors.get(item, self_min) + other.errors.get(item, other_min)
+
+        kept = {item for item, _ in top_items(counts, self.capacity)}
+        self.total += other.total
+        self.counts = {item: count for item, count in counts.items() if item in kept}
+        self.errors = {item: errors[item] for item in self.counts}
+        self._buckets = {}
+        for item, count in self.counts.items():
+            self._buckets.setdefault(count, {})[item] = None
+        self._min = min(self._buckets) if self._buckets else 0
+
+    def most_common(self, n: int = 10) -> List[Tuple[Hashable, int]]:
+        """
+        Devuelve los n elementos con mayor conteo estimado, con el desempate de `top_items`.
+        """
+        return top_items(self.counts, n)
+
+    def report(self, n: int = 10) -> TopKReport:
+        """
+        Devuelve el top-n junto con el error de cada conteo y la cota global de error.
+        """
+        items = self.most_common(n)
+        return TopKReport(
+            items=items,
+            errors=[self.errors[item] for item, _ in items],
+            error_bound=self.total // self.capacity,
+            total=self.total,
+        )
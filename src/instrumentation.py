@@ -0,0 +1,159 @@
+from collections import Counter
+from contextlib import contextmanager
+import json
+import os
+import resource
+import sys
+import threading
+import time
+
+
+# Segundos mínimos entre dos muestras de memoria
+SAMPLE_INTERVAL = 1.0
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss está en KiB en Linux (en bytes en macOS)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+class Recorder:
+    """
+    Registro de métricas del pipeline: tiempo por etapa, líneas procesadas y rechazadas, y
+    muestras periódicas del pico de memoria.
+
+    Está desactivado por defecto y se activa con la variable de entorno TWEETS_METRICS=1 o
+    con `enable()`. Desactivado, el motor solo consulta `enabled` una vez por llamada y
+    sigue por su camino normal, así que puede quedar habilitable en producción.
+
+    Attributes:
+        enabled (bool): Si se registran métricas.
+        stages (Counter): Segundos acumulados por etapa (suma entre hilos y procesos).
+        counts (Counter): Contadores: líneas leídas, tweets válidos y rechazos por campo.
+        memory_samples (list): Pares (segundos desde el inicio, pico de RSS en MiB).
+        sink (Callable[[dict], None]): Función que recibe cada reporte al cerrar una medición;
+                                       por defecto escribe una línea JSON en stderr.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.sink = self._log
+        self._lock = threading.Lock()
+        self._depth = 0
+        self.reset()
+
+    def reset(self) -> None:
+        self.stages = Counter()
+        self.counts = Counter()
+        self.memory_samples = []
+        self._start = time.perf_counter()
+        self._last_sample = float("-inf")
+
+    def enable(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+
+    def add_times(self, **seconds: float) -> None:
+        with self._lock:
+            self.stages.update(seconds)
+
+    def add_counts(self, **counts: int) -> None:
+        with self._lock:
+            self.counts.update(counts)
+
+    def sample_memory(self, force: bool = False) -> None:
+        """
+        Registra el pico de memoria si pasó al menos SAMPLE_INTERVAL desde la última muestra.
+        """
+        now = time.perf_counter()
+        if force or now - self._last_sample >= SAMPLE_INTERVAL:
+            with self._lock:
+                self._last_sample = now
+                self.memory_samples.append((round(now - self._start, 3), _peak_rss_mb()))
+
+    @contextmanager
+    def timer(self, stage: str):
+        """
+        Mide el bloque como una etapa. Si el registro está desactivado, no mide nada.
+        """
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_times(**{stage: time.perf_counter() - start})
+
+    def snapshot(self) -> dict:
+        """
+        Devuelve las métricas acumuladas en un diccionario serializable (por ejemplo, para
+        enviarlas desde un proceso del pool al proceso principal).
+        """
+        with self._lock:
+            return {
+                "stages": dict(self.stages),
+                "counts": dict(self.counts),
+                "memory_samples": list(self.memory_samples),
+            }
+
+    def merge(self, snapshot: dict) -> None:
+        """
+        Suma las métricas de otro proceso.
+        """
+        with self._lock:
+            self.stages.update(snapshot["stages"])
+            self.counts.update(snapshot["counts"])
+            self.memory_samples.extend(snapshot["memory_samples"])
+
+    @contextmanager
+    def recording(self, name: str, **labels):
+        """
+        Delimita una medición (por ejemplo, una llamada a q1_time). Al salir de la medición
+        más externa se arma el reporte, se entrega a `sink` y queda en `run["report"]`.
+
+        Args:
+            name (str): Nombre de la medición.
+            **labels: Datos adicionales del reporte (archivo, opciones, etc.).
+
+        Returns:
+            dict: Diccionario cuya llave "report" tendrá el reporte al terminar (None si el
+                  registro está desactivado o la medición está anidada en otra).
+        """
+        run = {"report": None}
+        if not self.enabled:
+            yield run
+            return
+        outermost = self._depth == 0
+        if outermost:
+            self.reset()
+        self._depth += 1
+        try:
+            yield run
+        finally:
+            self._depth -= 1
+            if outermost:
+                self.sample_memory(force=True)
+                run["report"] = self.report(name, **labels)
+                self.sink(run["report"])
+
+    def report(self, name: str, **labels) -> dict:
+        elapsed = time.perf_counter() - self._start
+        snapshot = self.snapshot()
+        lines = snapshot["counts"].get("lines", 0)
+        return {
+            "message": f"{name} metrics",
+            **labels,
+            "elapsed_seconds": elapsed,
+            "lines_per_sec": lines / elapsed if elapsed else None,
+            "peak_rss_mb": max((peak for _, peak in snapshot["memory_samples"]), default=_peak_rss_mb()),
+            **snapshot,
+        }
+
+    @staticmethod
+    def _log(report: dict) -> None:
+        print(json.dumps(report, default=str), file=sys.stderr)
+
+
+# Registro del proceso
+recorder = Recorder(enabled=os.environ.get("TWEETS_METRICS", "") not in ("", "0"))
@@ -0,0 +1,79 @@
+from typing import Callable
+import ujson
+
+try:
+    import simdjson
+except ImportError:  # pysimdjson es opcional: sin él se parsea el tweet completo con ujson
+    simdjson = None
+
+
+# Resultado de una línea que no es JSON válido (por ejemplo, la última línea a medio escribir
+# de un archivo que todavía crece). Los validadores la rechazan con el error ("tweet", "json")
+UNDECODABLE = object()
+
+
+def _plain(value):
+    # Convierte los proxies de simdjson en objetos de Python, para no retenerlos
+    # después de que el parser lea la siguiente línea
+    if isinstance(value, simdjson.Object):
+        return value.as_dict()
+    if isinstance(value, simdjson.Array):
+        return value.as_list()
+    return value
+
+
+def _ujson_loads(line) -> object:
+    # ujson no respeta el largo de un memoryview (lee más allá del fin de la línea),
+    # así que las líneas del archivo mapeado se copian a bytes antes de parsearlas
+    try:
+        return ujson.loads(bytes(line) if isinstance(line, memoryview) else line)
+    except ValueError:
+        return UNDECODABLE
+
+
+class TweetProjector:
+    """
+    Parser que extrae solo date, user.username y content de una línea JSON.
+
+    Usa el parser bajo demanda de simdjson: los objetos anidados que nadie lee (user completo,
+    media, quotedTweet, retweetedTweet, etc.) nunca se convierten en objetos de Python. El
+    resultado es un diccionario reducido con la misma forma que el tweet original para esos
+    campos, así que lo aceptan tanto FieldValidator como los agregadores.
+    """
+
+    def __init__(self):
+        self._parser = simdjson.Parser()
+
+    def __call__(self, line: bytes):
+        try:
+            doc = self._parser.parse(line)
+        except ValueError:
+            return UNDECODABLE
+        if not isinstance(doc, simdjson.Object):
+            return _plain(doc)
+
+        tweet = {"date": _plain(doc.get("date")), "content": _plain(doc.get("content"))}
+        user = doc.get("user")
+        if isinstance(user, simdjson.Object):
+            tweet["user"] = {"username": _plain(user.get("username"))}
+        elif user is not None:
+            tweet["user"] = _plain(user)
+        return tweet
+
+
+def tweet_loader(full_tweet: bool = False) -> Callable[[bytes], object]:
+    """
+    Devuelve la función que convierte cada línea en el diccionario del tweet.
+
+    Args:
+        full_tweet (bool): Si es True (por ejemplo, para validar con el TweetModel completo),
+                           se parsea el tweet entero con ujson. Si no, se proyectan solo los
+                           campos que leen las consultas, cuando pysimdjson está instalado.
+
+    Returns:
+        Callable[[bytes], object]: Función que recibe una línea JSON y devuelve el tweet, o
+                                   UNDECODABLE si la línea no es JSON válido.
+    """
+    if full_tweet or simdjson is None:
+        return _ujson_loads
+    return TweetProjector()
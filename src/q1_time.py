@@ -1,18 +1,22 @@
 from typing import List, Tuple
 from datetime import datetime
-from collections import defaultdict, Counter
-import ujson
-from utils import validate_tweet
+from engine import query
 
-def q1_time(file_path: str) -> List[Tuple[datetime.date, str]]:
+
+def q1_time(file_path: str, **options) -> List[Tuple[datetime.date, str]]:
     """
     Procesa un archivo JSON línea por línea, analiza los tweets contenidos en él
     y devuelve una lista con las 10 fechas con más tweets y el usuario que más tweets
     publicó en cada una de esas fechas.
 
+    Los tweets se leen y validan una sola vez con el motor de `engine.py`, que
+    calcula q1, q2 y q3 en la misma pasada; esta función solo consulta su resultado.
+
     Args:
         file_path (str): La ruta al archivo JSON que contiene los tweets. Cada línea del archivo
                          debe ser un objeto JSON que representa un tweet.
+        **options: Opciones del motor, por ejemplo `workers` para el modo paralelo
+                   (ver `engine.analyze_file`).
 
     Returns:
         List[Tuple[datetime.date, str]]: Una lista de tuplas, donde cada tupla contiene una fecha
@@ -20,34 +24,7 @@ def q1_time(file_path: str) -> List[Tuple[datetime.date, str]]:
                                          en esa fecha. La lista está ordenada por la cantidad de tweets
                                          en orden descendente, incluyendo solo las 10 fechas principales.
     """
-    
-    # Se usa ujson para la lectura del archivo
-    with open(file_path, 'r') as file:
-        data = [ujson.loads(line) for line in file]
-    
-    # Contador para rastrear la cantidad de tweets por usuario en cada fecha
-    date_user_count = defaultdict(lambda: Counter())
-    
-    for tweet in data:
-        # Validación del schema
-        if not validate_tweet(tweet):
-            continue
-
-        # Extraer la fecha del tweet y convertirla a un objeto de fecha
-        date = datetime.strptime(tweet["date"], "%Y-%m-%dT%H:%M:%S%z").date()
-
-        # Extraer el nombre de usuario del tweet
-        user = tweet["user"]["username"]
-
-        # Incrementar el contador para el usuario en la fecha correspondiente
-        date_user_count[date][user] += 1
-    
-    # Ordenar por cantidad de tweets y obtener las 10 fechas principales
-    top_dates = sorted(date_user_count.items(), key=lambda x: sum(x[1].values()), reverse=True)[:10]
-    
-    # Obtener el usuario con más publicaciones en cada fecha
-    result = [(date, user_count.most_common(1)[0][0]) for date, user_count in top_dates]
-    return result
+    return query(file_path, "q1", **options)
 
 
 if __name__ == '__main__':
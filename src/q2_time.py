@@ -1,41 +1,26 @@
 from typing import List, Tuple
-from collections import Counter
-import regex
-import ujson
-from utils import validate_tweet, extract_emojis
+from engine import query
 
 
-emoji_pattern = regex.compile(r'\X')
-def q2_time(file_path: str) -> List[Tuple[str, int]]:
+def q2_time(file_path: str, **options) -> List[Tuple[str, int]]:
     """
     Procesa un archivo JSON línea por línea, analiza el contenido de los tweets
     y devuelve una lista con los 10 emojis más usados y su respectivo conteo.
 
+    Los tweets se leen y validan una sola vez con el motor de `engine.py`, que
+    calcula q1, q2 y q3 en la misma pasada; esta función solo consulta su resultado.
+
     Args:
         file_path (str): La ruta al archivo JSON que contiene los tweets. Cada línea del archivo
                          debe ser un objeto JSON que representa un tweet.
+        **options: Opciones del motor, por ejemplo `workers` para el modo paralelo
+                   (ver `engine.analyze_file`).
 
     Returns:
         List[Tuple[str, int]]: Una lista de tuplas, donde cada tupla contiene un emoji y su conteo.
                                La lista está ordenada por conteo en orden descendente, incluyendo solo los 10 emojis principales.
     """
-    
-    # Leer y procesar el archivo en una sola pasada para mejorar la eficiencia
-    with open(file_path, 'r') as file:
-        data = [ujson.loads(line) for line in file]
-
-    emoji_count = Counter()
-
-    for tweet in data:
-        if not validate_tweet(tweet):
-            continue
-
-        content = tweet.get("content", "")
-        emojis = extract_emojis(content, emoji_pattern)
-        emoji_count.update(emojis)
-        
-    result = emoji_count.most_common(10)
-    return result
+    return query(file_path, "q2", **options)
 
 
 if __name__ == '__main__':
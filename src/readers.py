@@ -0,0 +1,199 @@
+from typing import Iterable, Iterator, List, Optional, Tuple
+import mmap
+import os
+import numpy as np
+from compressed import is_compressed, iter_compressed_lines, split_compressed
+
+
+# Bytes con los que puede empezar una línea en blanco
+_BLANK = frozenset(b" \t\r\n")
+
+# Bytes leídos entre dos liberaciones de páginas del mapeo (múltiplo del tamaño de página)
+RELEASE_EVERY = 8 * 1024 * 1024
+
+# Liberación de páginas de un mapeo (no existe en todas las plataformas)
+_DONTNEED = getattr(mmap, "MADV_DONTNEED", None)
+
+
+def map_file(file_path: str) -> Optional[mmap.mmap]:
+    """
+    Mapea un archivo en memoria en modo solo lectura.
+
+    El mapeo usa el page cache del sistema operativo: ejecuciones seguidas sobre el mismo
+    archivo no vuelven a pasar por buffers de Python. El archivo puede cerrarse después de
+    mapearlo; el mapeo se libera cuando no quedan referencias a él ni a sus memoryview.
+
+    Args:
+        file_path (str): La ruta al archivo.
+
+    Returns:
+        Optional[mmap.mmap]: El mapeo, o None si el archivo está vacío (no se puede mapear).
+    """
+    with open(file_path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def next_line_start(mapped: mmap.mmap, position: int) -> int:
+    """
+    Devuelve el primer inicio de línea en o después de `position`.
+    """
+    if position <= 0:
+        return 0
+    newline = mapped.find(b"\n", position - 1)
+    return len(mapped) if newline < 0 else newline + 1
+
+
+def iter_lines(file_path: str, start: int = 0, end: Optional[int] = None) -> Iterator[memoryview]:
+    """
+    Itera sin copias las líneas que comienzan dentro del rango [start, end) de un archivo.
+
+    Cada línea es un memoryview sobre el archivo mapeado (incluye el salto de línea). Las
+    líneas en blanco se omiten.
+
+    Los archivos .gz y .zst se descomprimen como flujo (ver compressed.py); en ese caso el
+    rango es de índices de bloques comprimidos, como los que entrega `split_file`, y cada
+    línea es un bytes sin el salto de línea.
+
+    Args:
+        file_path (str): La ruta al archivo.
+        start (int): Byte inicial del rango, al comienzo de una línea.
+        end (Optional[int]): Byte final (exclusivo) del rango; por defecto, el fin del archivo.
+
+    Returns:
+        Iterator[memoryview]: Las líneas del rango, en orden.
+    """
+    if is_compressed(file_path):
+        yield from iter_compressed_lines(file_path, start, end)
+        return
+    mapped = map_file(file_path)
+    if mapped is None:
+        return
+    view = memoryview(mapped)
+    for position, stop in _releasing(mapped, _line_spans(mapped, start, end)):
+        yield view[position:stop]
+
+
+def iter_lines_at(file_path: str, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, memoryview]]:
+    """
+    Igual que `iter_lines` para un archivo sin comprimir, pero entrega también el byte donde
+    comienza cada línea (por ejemplo, para indexarlas).
+
+    Returns:
+        Iterator[Tuple[int, memoryview]]: Pares (offset, línea), en orden.
+    """
+    mapped = map_file(file_path)
+    if mapped is None:
+        return
+    view = memoryview(mapped)
+    for position, stop in _releasing(mapped, _line_spans(mapped, start, end)):
+        yield position, view[position:stop]
+
+
+def iter_spans(file_path: str, spans: Iterable[Tuple[int, int]]) -> Iterator[memoryview]:
+    """
+    Itera sin copias los rangos de bytes [inicio, fin) indicados de un archivo, por ejemplo
+    las líneas que un índice ubicó. Los rangos deben venir en orden creciente.
+    """
+    mapped = map_file(file_path)
+    if mapped is None:
+        return
+    view = memoryview(mapped)
+    for position, stop in _releasing(mapped, spans):
+        yield view[position:stop]
+
+
+def line_offset(line) -> Optional[int]:
+    """
+    Devuelve el byte donde comienza una línea entregada por `iter_lines` sobre un archivo
+    mapeado, o None si la línea no apunta a un archivo mapeado (archivos comprimidos, GCS).
+    """
+    if not isinstance(line, memoryview) or not isinstance(line.obj, mmap.mmap) or not line.nbytes:
+        return None
+    address = np.frombuffer(line, dtype=np.uint8, count=1).ctypes.data
+    return address - np.frombuffer(line.obj, dtype=np.uint8, count=1).ctypes.data
+
+
+def release_pages(mapped: mmap.mmap, start: int, stop: int) -> None:
+    """
+    Devuelve al sistema operativo las páginas del mapeo entre `start` y `stop` (alineados al
+    tamaño de página).
+
+    Las páginas de un mapeo que ya se leyeron siguen contando en la memoria residente del
+    proceso hasta que se liberan, así que sin esto el pico de memoria crece con el tamaño
+    del archivo. Si una página liberada se vuelve a leer, se carga de nuevo desde el page cache.
+    """
+    if _DONTNEED is not None and start < stop:
+        mapped.madvise(_DONTNEED, start, stop - start)
+
+
+def _releasing(mapped: mmap.mmap, spans: Iterable[Tuple[int, int]]) -> Iterator[Tuple[int, int]]:
+    # Entrega los rangos (en orden creciente) y cada RELEASE_EVERY bytes libera las páginas
+    # que quedaron al menos RELEASE_EVERY bytes atrás: el lote en curso del motor puede seguir
+    # leyendo sus líneas. Cada liberación vuelve a cubrir la ventana anterior, por si alguna
+    # de sus páginas se leyó de nuevo
+    released = None
+    for position, stop in spans:
+        if released is None:
+            released = position - position % mmap.PAGESIZE
+        limit = position - RELEASE_EVERY
+        if limit - released >= RELEASE_EVERY:
+            limit -= limit % mmap.PAGESIZE
+            release_pages(mapped, max(released - RELEASE_EVERY, 0), limit)
+            released = limit
+        yield position, stop
+
+
+def _line_spans(mapped: mmap.mmap, start: int, end: Optional[int]) -> Iterator[Tuple[int, int]]:
+    # Inicio y fin de cada línea no vacía que comienza en [start, end)
+    size = len(mapped)
+    end = size if end is None else min(end, size)
+    position = start
+    while position < end:
+        newline = mapped.find(b"\n", position)
+        stop = size if newline < 0 else newline + 1
+        if mapped[position] not in _BLANK or mapped[position:stop].strip():
+            yield position, stop
+        position = stop
+
+
+def split_file(file_path: str, shards: int) -> List[Tuple[int, int]]:
+    """
+    Divide el archivo en rangos de bytes [inicio, fin) alineados al inicio de una línea.
+
+    Un archivo comprimido se divide en rangos de bloques (ver compressed.split_compressed).
+
+    Args:
+        file_path (str): La ruta al archivo.
+        shards (int): Cantidad de rangos deseada.
+
+    Returns:
+        List[Tuple[int, int]]: Rangos contiguos y en orden que cubren todo el archivo.
+    """
+    if is_compressed(file_path):
+        return split_compressed(file_path, shards)
+    mapped = map_file(file_path)
+    if mapped is None:
+        return []
+    with mapped:
+        size = len(mapped)
+        bounds = [0]
+        for i in range(1, shards):
+            bounds.append(next_line_start(mapped, max(size * i // shards, bounds[-1])))
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+
+def complete_end(file_path: str) -> int:
+    """
+    Devuelve el byte siguiente al último salto de línea del archivo.
+
+    Una última línea sin salto de línea puede estar a medio escribir, así que quien lee
+    un archivo que crece puede dejarla para la próxima lectura.
+    """
+    mapped = map_file(file_path)
+    if mapped is None:
+        return 0
+    with mapped:
+        return mapped.rfind(b"\n") + 1
@@ -0,0 +1,97 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+import os
+from readers import line_offset
+
+
+# Cantidad máxima de líneas de ejemplo que se guardan por ejecución
+MAX_SAMPLES = 10
+
+# Bytes de cada línea de ejemplo que se conservan
+SAMPLE_BYTES = 300
+
+# Bytes de líneas rechazadas que se acumulan antes de escribirlas al archivo de descarte
+DEAD_LETTER_BUFFER = 1024 * 1024
+
+
+class RejectionLog:
+    """
+    Ejemplos y archivo de descarte (dead letter) de las líneas rechazadas por un validador.
+
+    Los conteos por campo y tipo de error los lleva el validador; este registro solo recibe
+    las líneas rechazadas de cada lote, así que un tweet válido no paga nada. Se guardan
+    hasta `max_samples` líneas de ejemplo con su offset en bytes y, si se indica un archivo
+    de descarte, las líneas completas se acumulan en memoria y se escriben en bloque.
+
+    Attributes:
+        dead_letter (Optional[str]): Archivo al que se agregan las líneas rechazadas, una por
+                                     línea. Varios procesos pueden escribir en el mismo
+                                     archivo: cada bloque se agrega con una sola escritura.
+        samples (List[dict]): Ejemplos, con el offset de la línea (None si la línea no viene
+                              de un archivo mapeado), sus errores y su inicio.
+        max_samples (int): Cantidad máxima de ejemplos.
+    """
+
+    def __init__(self, dead_letter: Optional[str] = None, max_samples: int = MAX_SAMPLES):
+        self.dead_letter = dead_letter
+        self.samples = []
+        self.max_samples = max_samples
+        self._buffer = []
+        self._buffered = 0
+
+    @property
+    def wants_samples(self) -> bool:
+        return len(self.samples) < self.max_samples
+
+    def add_sample(self, line, errors: Iterable[Tuple[str, str]]) -> None:
+        """
+        Guarda una línea rechazada como ejemplo, si todavía hay lugar.
+        """
+        if not self.wants_samples:
+            return
+        self.samples.append({
+            "offset": line_offset(line),
+            "errors": [f"{field}:{kind}" for field, kind in errors],
+            "line": bytes(line[:SAMPLE_BYTES]).decode("utf-8", errors="replace").rstrip(),
+        })
+
+    def add_lines(self, lines: List) -> None:
+        """
+        Agrega líneas rechazadas al archivo de descarte (en bloque, ver `flush`).
+        """
+        if self.dead_letter is None:
+            return
+        for line in lines:
+            line = bytes(line)
+            self._buffer.append(line if line.endswith(b"\n") else line + b"\n")
+            self._buffered += len(self._buffer[-1])
+        if self._buffered >= DEAD_LETTER_BUFFER:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Escribe las líneas acumuladas al archivo de descarte con una sola escritura.
+        """
+        if not self._buffer:
+            return
+        descriptor = os.open(self.dead_letter, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(descriptor, b"".join(self._buffer))
+        finally:
+            os.close(descriptor)
+        self._buffer, self._buffered = [], 0
+
+    def merge(self, other: "RejectionLog") -> None:
+        # Los ejemplos del otro rango van después: se conservan los primeros del archivo
+        self.samples.extend(other.samples[:self.max_samples - len(self.samples)])
+        other.flush()
+
+
+def errors_by_field(errors: Dict[Tuple[str, str], int]) -> Dict[str, Dict[str, int]]:
+    """
+    Agrupa los conteos de errores por (campo, tipo) en un diccionario por campo, por
+    ejemplo {"date": {"format": 3, "missing": 1}}.
+    """
+    grouped = {}
+    for (field, kind), count in sorted(errors.items()):
+        grouped.setdefault(field, {})[kind] = count
+    return grouped
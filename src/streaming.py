@@ -0,0 +1,280 @@
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+import argparse
+import queue
+import threading
+from engine import AGGREGATORS, merge_results, new_result
+from projection import tweet_loader
+from utils import date_seconds
+
+
+# ========================
+# Fuentes de mensajes
+# ========================
+
+class QueueSource:
+    """
+    Fuente de mensajes sobre una cola en memoria del proceso. Reemplaza a Pub/Sub en pruebas
+    locales: un productor pone cada línea JSON (bytes) en la cola y `None` para terminar.
+
+    Attributes:
+        messages (queue.Queue): La cola de mensajes.
+        timeout (Optional[float]): Segundos máximos de espera por un mensaje; si se cumplen,
+                                   la fuente termina. None espera indefinidamente.
+    """
+
+    def __init__(self, messages: Optional[queue.Queue] = None, timeout: Optional[float] = None):
+        self.messages = messages if messages is not None else queue.Queue()
+        self.timeout = timeout
+
+    def put(self, message: Optional[bytes]) -> None:
+        self.messages.put(message)
+
+    def close(self) -> None:
+        self.messages.put(None)
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            try:
+                message = self.messages.get(timeout=self.timeout)
+            except queue.Empty:
+                return
+            if message is None:
+                return
+            yield message
+
+
+class PubSubSource(QueueSource):
+    """
+    Fuente de mensajes de una suscripción de Pub/Sub (requiere google-cloud-pubsub).
+
+    El streaming pull de Pub/Sub entrega los mensajes en sus propios hilos; cada mensaje se
+    pasa a la cola local y se confirma (ack) recién cuando el consumidor pide el siguiente,
+    es decir, después de haberlo agregado.
+
+    Attributes:
+        subscription (str): Ruta de la suscripción, "projects/<proyecto>/subscriptions/<nombre>".
+    """
+
+    def __init__(self, subscription: str, timeout: Optional[float] = None, max_messages: int = 1000):
+        super().__init__(queue.Queue(maxsize=max_messages), timeout)
+        self.subscription = subscription
+
+    def __iter__(self) -> Iterator[bytes]:
+        from google.cloud import pubsub_v1
+
+        subscriber = pubsub_v1.SubscriberClient()
+        future = subscriber.subscribe(self.subscription, callback=self.messages.put)
+        pending = None
+        try:
+            while True:
+                try:
+                    message = self.messages.get(timeout=self.timeout)
+                except queue.Empty:
+                    return
+                if pending is not None:
+                    pending.ack()
+                    pending = None
+                if message is None:
+                    return
+                pending = message
+                yield message.data
+        finally:
+            if pending is not None:
+                pending.ack()
+            future.cancel()
+            subscriber.close()
+
+
+# ========================
+# Agregación por ventanas
+# ========================
+
+def event_time(tweet: dict) -> int:
+    """
+    Devuelve la fecha del tweet, ya validada, como segundos desde 1970 (UTC).
+    """
+    return date_seconds(tweet["date"])
+
+
+class StreamProcessor:
+    """
+    Mantiene agregados de q1, q2 y q3 que se actualizan con cada mensaje, tanto acumulados
+    como por ventanas de tiempo del evento (la fecha del tweet).
+
+    Las ventanas se arman con paneles de `slide` segundos: cada tweet se agrega a un único
+    panel (costo constante por mensaje) y el top de una ventana combina los `window / slide`
+    paneles que la forman. Con `slide` igual a `window` las ventanas son fijas (tumbling);
+    con un `slide` menor, deslizantes. Los paneles que ya no pueden formar parte de una
+    ventana se descartan, así que la memoria depende del tamaño de la ventana y no del
+    largo del stream.
+
+    Las ventanas se alinean a múltiplos de `slide` en UTC. El top de una ventana es el mismo
+    que el de procesar en lote sus tweets: los paneles se combinan en orden de tiempo, pero
+    los empates se resuelven sin depender del orden (ver heavy_hitters.top_items).
+
+    Attributes:
+        window (int): Largo de la ventana en segundos.
+        slide (int): Cada cuántos segundos comienza una ventana nueva.
+        lateness (int): Segundos de atraso tolerados respecto del tweet más reciente; los
+                        tweets más atrasados solo cuentan en los agregados acumulados.
+        total (Dict[str, object]): Agregadores acumulados desde el inicio y el validador.
+        watermark (Optional[int]): Fecha (segundos) del tweet más reciente procesado.
+        late (int): Cantidad de tweets que llegaron demasiado tarde para sus ventanas.
+    """
+
+    def __init__(self, window: int = 86400, slide: Optional[int] = None, lateness: int = 0, **config):
+        self.window = window
+        self.slide = slide or window
+        if self.window % self.slide:
+            raise ValueError("window debe ser múltiplo de slide")
+        self.lateness = lateness
+        self.config = config
+        self.total = new_result(**config)
+        self.watermark = None
+        self.late = 0
+        self._panes = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _loads(self, message: bytes) -> dict:
+        # Cada hilo usa su propio parser: uno de pysimdjson no se puede reutilizar mientras
+        # otro hilo tiene un documento abierto (por ejemplo, callbacks de Pub/Sub)
+        loads = getattr(self._local, "loads", None)
+        if loads is None:
+            loads = self._local.loads = tweet_loader(self.total["validation"].full_tweet)
+        return loads(message)
+
+    def process(self, message: bytes) -> bool:
+        """
+        Parsea, valida y agrega un mensaje (una línea JSON con un tweet).
+
+        Un mensaje inválido, incluido uno que no es JSON, no corta el consumo: el validador lo
+        cuenta (el JSON inválido como ("tweet", "json")), lo guarda como ejemplo y, si se
+        pidió, lo escribe en el archivo de descarte.
+
+        Returns:
+            bool: True si el tweet era válido y se agregó.
+        """
+        tweet = self._loads(message)
+        with self._lock:
+            validator = self.total["validation"]
+            if not validator(tweet):  # Validar el esquema del tweet
+                validator.reject([message], [tweet])
+                return False
+            for name in AGGREGATORS:
+                self.total[name].add(tweet)
+
+            timestamp = event_time(tweet)
+            if self.watermark is None or timestamp > self.watermark:
+                self.watermark = timestamp
+                self._expire()
+            pane = timestamp // self.slide
+            if pane < self._oldest_pane():
+                self.late += 1
+                return True
+            if pane not in self._panes:
+                self._panes[pane] = self._new_pane()
+            for name, aggregator in self._panes[pane].items():
+                aggregator.add(tweet)
+            return True
+
+    def run(self, source: Iterable[bytes], on_message: Optional[Callable[["StreamProcessor"], None]] = None) -> int:
+        """
+        Consume una fuente de mensajes hasta que termine.
+
+        Args:
+            source (Iterable[bytes]): Fuente de mensajes (por ejemplo, QueueSource o PubSubSource).
+            on_message (Optional[Callable]): Función llamada después de cada mensaje con el
+                                             procesador, por ejemplo para publicar el top actual.
+
+        Returns:
+            int: Cantidad de mensajes consumidos.
+        """
+        count = 0
+        for message in source:
+            if message.strip():
+                self.process(message)
+            count += 1
+            if on_message is not None:
+                on_message(self)
+        self.total["validation"].log.flush()
+        return count
+
+    def top(self, name: str, n: int = 10) -> List[tuple]:
+        """
+        Devuelve el top-n acumulado de una pregunta ("q1", "q2" o "q3").
+        """
+        with self._lock:
+            return self.total[name].top(n)
+
+    def window_top(self, name: str, n: int = 10, end: Optional[int] = None) -> List[tuple]:
+        """
+        Devuelve el top-n de una pregunta dentro de una ventana.
+
+        Args:
+            name (str): La pregunta ("q1", "q2" o "q3").
+            n (int): Cantidad de elementos del top.
+            end (Optional[int]): Fin (exclusivo, en segundos) de la ventana. Debe ser múltiplo de
+                                 `slide`; por defecto, la ventana que contiene al tweet más reciente.
+
+        Returns:
+            List[tuple]: El top-n, con el mismo formato que el de la consulta acumulada.
+        """
+        with self._lock:
+            return self._window(end)[name].top(n)
+
+    def windows(self, n: int = 10) -> Dict[int, Dict[str, List[tuple]]]:
+        """
+        Devuelve el top-n de q1, q2 y q3 de cada ventana que termina en un panel aún en
+        memoria, indexado por el inicio de la ventana (en segundos).
+        """
+        with self._lock:
+            result = {}
+            for pane in sorted(self._panes):
+                window = self._window((pane + 1) * self.slide)
+                result[(pane + 1) * self.slide - self.window] = {name: window[name].top(n) for name in AGGREGATORS}
+            return result
+
+    def _new_pane(self) -> Dict[str, object]:
+        result = new_result(**self.config)
+        return {name: result[name] for name in AGGREGATORS}
+
+    def _window(self, end: Optional[int]) -> Dict[str, object]:
+        if end is None:
+            end = (self.watermark // self.slide + 1) * self.slide if self.watermark is not None else 0
+        last = end // self.slide - 1
+        panes = (self._panes[pane] for pane in range(last - self.window // self.slide + 1, last + 1) if pane in self._panes)
+        return merge_results(panes, **self.config)
+
+    def _oldest_pane(self) -> int:
+        # Primer panel de la ventana más antigua que todavía puede recibir tweets
+        return (self.watermark - self.lateness) // self.slide - self.window // self.slide + 1
+
+    def _expire(self) -> None:
+        oldest = self._oldest_pane()
+        for pane in [pane for pane in self._panes if pane < oldest]:
+            del self._panes[pane]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Simula la ingesta en streaming de un archivo de tweets.")
+    parser.add_argument("file_path")
+    parser.add_argument("--window", type=int, default=86400)
+    parser.add_argument("--slide", type=int)
+    parser.add_argument("--lateness", type=int, default=0)
+    args = parser.parse_args()
+
+    source = QueueSource()
+
+    def produce() -> None:
+        with open(args.file_path, "rb") as file:
+            for line in file:
+                source.put(line)
+        source.close()
+
+    threading.Thread(target=produce, daemon=True).start()
+    processor = StreamProcessor(window=args.window, slide=args.slide, lateness=args.lateness)
+    processor.run(source)
+    for name in AGGREGATORS:
+        print(name, "total:", processor.top(name))
+        print(name, "ventana actual:", processor.window_top(name))
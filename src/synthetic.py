@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta
+import argparse
+import json
+import random
+
+
+EMOJIS = ["🙏", "❤️", "😂", "👍🏽", "🌾", "✊", "🚜", "💪", "🇮🇳", "👨‍🌾", "😡", "🙏🏻"]
+WORDS = ["farmers", "protest", "india", "support", "delhi", "law", "government", "#FarmersProtest",
+         "kisan", "today", "justice", "stand", "with", "the", "for", "and"]
+
+
+def _user(rng: random.Random, index: int) -> dict:
+    username = f"user_{index}"
+    return {
+        "username": username,
+        "displayname": f"User {index}",
+        "id": 10 ** 9 + index,
+        "description": "Synthetic profile",
+        "rawDescription": "Synthetic profile",
+        "descriptionUrls": [],
+        "verified": index % 50 == 0,
+        "created": "2015-01-01T00:00:00+00:00",
+        "followersCount": rng.randint(0, 10 ** 5),
+        "friendsCount": rng.randint(0, 5000),
+        "statusesCount": rng.randint(0, 10 ** 5),
+        "favouritesCount": rng.randint(0, 10 ** 5),
+        "listedCount": rng.randint(0, 100),
+        "mediaCount": rng.randint(0, 1000),
+        "location": "India",
+        "protected": False,
+        "linkUrl": None,
+        "linkTcourl": None,
+        "profileImageUrl": f"https://pbs.twimg.com/profile_images/{index}/photo.jpg",
+        "profileBannerUrl": None,
+        "url": f"https://twitter.com/{username}",
+    }
+
+
+def generate_tweets(file_path: str, lines: int, users: int = 5000, days: int = 30,
+                    invalid_ratio: float = 0.001, seed: int = 0) -> None:
+    """
+    Escribe un archivo JSONL de tweets sintéticos con la forma de TweetModel.
+
+    Los usuarios (autores y menciones) siguen una distribución tipo Zipf, de modo que hay
+    usuarios claramente dominantes como en los datos reales. Una fracción de las líneas
+    tiene una fecha inválida para ejercitar la validación.
+
+    Args:
+        file_path (str): La ruta del archivo a escribir.
+        lines (int): Cantidad de tweets.
+        users (int): Cantidad de usuarios distintos.
+        days (int): Cantidad de días distintos a partir del 2021-02-01.
+        invalid_ratio (float): Fracción de tweets con fecha inválida.
+        seed (int): Semilla del generador, para obtener siempre el mismo archivo.
+    """
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(users)]
+    start = datetime(2021, 2, 1)
+    profiles = {}
+
+    with open(file_path, "w") as file:
+        for tweet_id in range(lines):
+            author = rng.choices(range(users), weights)[0]
+            if author not in profiles:
+                profiles[author] = _user(rng, author)
+            mentioned = rng.choices(range(users), weights, k=rng.choice([0, 0, 1, 1, 2, 3]))
+
+            words = rng.choices(WORDS, k=rng.randint(5, 30))
+            words += [f"@user_{index}" for index in mentioned]
+            if rng.random() < 0.3:
+                words += rng.choices(EMOJIS, k=rng.randint(1, 4))
+            rng.shuffle(words)
+            content = " ".join(words)
+
+            date = start + timedelta(days=rng.randrange(days), seconds=rng.randrange(86400))
+            date_text = date.strftime("%Y-%m-%dT%H:%M:%S+00:00")
+            if rng.random() < invalid_ratio:
+                date_text = "not-a-date"
+
+            tweet = {
+                "url": f"https://twitter.com/user_{author}/status/{tweet_id}",
+                "date": date_text,
+                "content": content,
+                "renderedContent": content,
+                "id": 1360000000000000000 + tweet_id,
+                "user": profiles[author],
+                "outlinks": [],
+                "tcooutlinks": [],
+                "replyCount": rng.randint(0, 20),
+                "retweetCount": rng.randint(0, 100),
+                "likeCount": rng.randint(0, 500),
+                "quoteCount": rng.randint(0, 10),
+                "conversationId": 1360000000000000000 + tweet_id,
+                "lang": "en",
+                "source": "<a href=\"http://twitter.com/download/android\">Twitter for Android</a>",
+                "sourceUrl": "http://twitter.com/download/android",
+                "sourceLabel": "Twitter for Android",
+                "media": None,
+                "retweetedTweet": None,
+                "quotedTweet": None,
+                "mentionedUsers": [profiles.setdefault(index, _user(rng, index)) for index in mentioned] or None,
+            }
+            file.write(json.dumps(tweet) + "\n")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Genera un archivo JSONL de tweets sintéticos.")
+    parser.add_argument("file_path")
+    parser.add_argument("--lines", type=int, default=100000)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    generate_tweets(args.file_path, args.lines, users=args.users, days=args.days, seed=args.seed)
@@ -1,7 +1,11 @@
-from datetime import datetime
-from typing import List, Tuple, Optional
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Tuple, Optional
+from collections import Counter
+from functools import lru_cache
 from pydantic import BaseModel, ValidationError, field_validator
-import emoji
+import re
+from rejections import RejectionLog, errors_by_field
+from projection import UNDECODABLE
 
 
 # ========================
@@ -135,65 +139,297 @@ class TweetModel(BaseModel):
             ValueError: Si la fecha no está en el formato correcto.
         """
 
-        try:
-            datetime.strptime(value, "%Y-%m-%dT%H:%M:%S%z")
-        except ValueError:
+        if date_ordinal(value) is None:
             raise ValueError("Incorrect date format")
         return value
 
-def validate_tweet(tweet: dict) -> bool:
+def tweet_errors(tweet: dict) -> List[Tuple[str, str]]:
     """
-    Valida que un diccionario de tweet cumpla con el esquema definido por TweetModel.
+    Devuelve los errores de un tweet respecto del esquema definido por TweetModel.
 
     Args:
         tweet (dict): Diccionario que representa el tweet.
 
     Returns:
-        bool: True si el tweet es válido, False si no lo es.
-
-    Raises:
-        ValidationError: Si el tweet no cumple con el esquema.
+        List[Tuple[str, str]]: Pares (campo, tipo de error de pydantic) de cada error; una
+                               lista vacía si el tweet es válido.
     """
-    
     try:
         TweetModel(**tweet)
-        return True
+        return []
     except ValidationError as e:
-        print(f"Validation error: {e}")
-        return False
+        return [
+            (".".join(str(part) for part in error["loc"] if isinstance(part, str)), error["type"])
+            for error in e.errors()
+        ]
+
+
+def validate_tweet(tweet: dict, rejections: Optional[Counter] = None) -> bool:
+    """
+    Valida que un diccionario de tweet cumpla con el esquema definido por TweetModel.
+
+    Los errores no se imprimen: se cuentan en `rejections` (ver ModelValidator para los
+    conteos por tipo de error y los ejemplos).
+
+    Args:
+        tweet (dict): Diccionario que representa el tweet.
+        rejections (Optional[Counter]): Si se entrega, suma un rechazo por cada campo inválido.
+
+    Returns:
+        bool: True si el tweet es válido, False si no lo es.
+    """
+    errors = tweet_errors(tweet)
+    if errors and rejections is not None:
+        rejections.update({field for field, _ in errors})
+    return not errors
 
 
 # ========================
-# Extracción de Emojis
+# Validación rápida por campos
 # ========================
 
-def extract_emojis(text, emoji_pattern):
+# Mismos patrones que usa datetime.strptime para "%Y-%m-%dT%H:%M:%S%z" (incluidos el día con
+# espacio en lugar de cero, la "T" sin distinguir mayúsculas y el uso consistente de ":" en %z)
+DATE_PATTERN = re.compile(
+    r'(?P<day>\d{4}-(?:1[0-2]|0[1-9]|[1-9])-(?:3[01]|[12]\d|0[1-9]|[1-9]| [1-9]))'
+    r'[Tt](?P<hour>2[0-3]|[01]\d|\d):(?P<minute>[0-5]\d|\d):(?P<second>[0-5]\d|\d)'
+    r'(?P<offset>Z|[+-](?:[01]\d|2[0-3])(?::[0-5]\d(?::[0-5]\d(?:\.\d{1,6})?)?|[0-5]\d(?:[0-5]\d(?:\.\d{1,6})?)?))'
+)
+
+# Ordinal del 1970-01-01, para pasar de días a segundos desde 1970
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+@lru_cache(maxsize=4096)
+def _day_ordinal(day: str) -> Optional[int]:
+    # Ordinal de un día "YYYY-MM-DD" (con o sin ceros a la izquierda), o None si el día no
+    # existe. Hay pocos días distintos por archivo, así que el resultado se cachea
+    year, month, day = day.split("-")
+    try:
+        return date(int(year), int(month), int(day)).toordinal()
+    except ValueError:
+        return None
+
+
+def date_ordinal(value: str) -> Optional[int]:
     """
-    Extrae todos los emojis de un texto dado utilizando una expresión regular,
-    excluyendo los modificadores de tono de piel.
+    Valida una fecha con el formato "%Y-%m-%dT%H:%M:%S%z" y devuelve el ordinal de su día.
+
+    Equivale a datetime.strptime(value, "%Y-%m-%dT%H:%M:%S%z").date().toordinal(): el día es
+    el de la hora local escrita en la fecha, sin convertirla a UTC, así que el offset solo se
+    valida. La hora y el offset se revisan con DATE_PATTERN y el calendario una vez por día.
 
     Args:
-        text (str): El texto del cual extraer emojis.
+        value (str): La fecha del tweet.
 
     Returns:
-        List[str]: Una lista de emojis encontrados en el texto, sin los modificadores de tono de piel.
+        Optional[int]: El ordinal del día (date.toordinal()), o None si la fecha no es válida.
     """
-    emojis = [word for word in emoji_pattern.findall(text) if any(char in emoji.EMOJI_DATA for char in word)]
-    return emojis
+    if not isinstance(value, str):
+        return None
+    match = DATE_PATTERN.fullmatch(value)
+    return None if match is None else _day_ordinal(match.group("day"))
 
 
-# ========================
-# Extracción de Menciones
-# ========================
-def extract_mentions(text: str, mention_pattern) -> List[str]:
+@lru_cache(maxsize=256)
+def _offset_seconds(offset: str) -> float:
+    # Segundos de un offset de DATE_PATTERN: "Z", "+HH:MM[:SS[.ffffff]]" o "+HHMM[SS[.ffffff]]"
+    if offset == "Z":
+        return 0.0
+    digits = offset[1:].replace(":", "")
+    seconds = int(digits[:2]) * 3600 + int(digits[2:4]) * 60 + float(digits[4:] or 0)
+    return -seconds if offset[0] == "-" else seconds
+
+
+def date_seconds(value: str) -> int:
     """
-    Extrae todas las menciones (@) de un texto dado utilizando una expresión regular.
-    
+    Devuelve una fecha ya validada (ver `date_ordinal`) como segundos desde 1970 (UTC).
+
+    Equivale a int(datetime.strptime(value, "%Y-%m-%dT%H:%M:%S%z").timestamp()), pero arma
+    el resultado desde DATE_PATTERN con el día y el offset cacheados, sin crear un datetime.
+
     Args:
-        text (str): El texto del cual extraer menciones.
+        value (str): La fecha del tweet.
 
     Returns:
-        List[str]: Una lista de menciones encontradas en el texto.
+        int: Segundos desde 1970-01-01T00:00:00Z.
+    """
+    match = DATE_PATTERN.fullmatch(value)
+    local = ((_day_ordinal(match.group("day")) - _EPOCH_ORDINAL) * 86400 + int(match.group("hour")) * 3600
+             + int(match.group("minute")) * 60 + int(match.group("second")))
+    return int(local - _offset_seconds(match.group("offset")))
+
+
+@lru_cache(maxsize=4096)
+def _prefix_ordinal(prefix: str) -> int:
+    # El día siempre cabe en los primeros 10 caracteres: "YYYY-MM-DD" o un día más corto
+    # seguido de la "T" y parte de la hora
+    return _day_ordinal(prefix.upper().partition("T")[0])
+
+
+@lru_cache(maxsize=4096)
+def _prefix_day(prefix: str) -> date:
+    return date.fromordinal(_prefix_ordinal(prefix))
+
+
+def day_ordinal(value: str) -> int:
+    """
+    Devuelve el ordinal del día de una fecha ya validada (ver `date_ordinal`). Solo mira el
+    prefijo de la fecha, cuyo resultado se cachea, así que no vuelve a parsearla.
+    """
+    return _prefix_ordinal(value[:10])
+
+
+def tweet_day(value: str) -> date:
+    """
+    Igual que `day_ordinal`, pero devuelve el día como date.
     """
-    mentions = mention_pattern.findall(text)
-    return [mention[1:] for mention in mentions] 
\ No newline at end of file
+    return _prefix_day(value[:10])
+
+
+def _check_date(tweet: dict) -> bool:
+    return date_ordinal(tweet.get("date")) is not None
+
+
+def _check_username(tweet: dict) -> bool:
+    user = tweet.get("user")
+    return isinstance(user, dict) and isinstance(user.get("username"), str)
+
+
+def _check_content(tweet: dict) -> bool:
+    content = tweet.get("content")
+    return content is None or isinstance(content, str)
+
+
+FIELD_CHECKS: Dict[str, Callable[[dict], bool]] = {
+    "date": _check_date,
+    "user.username": _check_username,
+    "content": _check_content,
+}
+
+
+def _error_type(tweet: dict, field: str) -> str:
+    # Tipo de error de un campo rechazado por FIELD_CHECKS: "missing" si falta (o es null),
+    # "type" si no es texto y "format" si es texto con un formato inválido
+    value = tweet
+    for part in field.split("."):
+        if not isinstance(value, dict):
+            return "type"
+        value = value.get(part)
+    if value is None:
+        return "missing"
+    return "format" if isinstance(value, str) else "type"
+
+
+class FieldValidator:
+    """
+    Validador rápido que revisa solo los campos que leen las consultas, sin construir
+    un TweetModel.
+
+    Un tweet inválido no imprime nada: se suma a los conteos por campo y por tipo de error,
+    que solo se calculan cuando un chequeo falla. Las líneas rechazadas se entregan después
+    por lote a `reject`, que guarda algunos ejemplos y, si se pidió, las escribe en un
+    archivo de descarte.
+
+    Attributes:
+        fields (Tuple[str, ...]): Campos revisados, en el formato de FIELD_CHECKS.
+        rejections (Counter): Cantidad de tweets rechazados por cada campo.
+        errors (Counter): Cantidad de errores por (campo, tipo de error).
+        rejected (int): Cantidad de tweets rechazados.
+        log (RejectionLog): Ejemplos y archivo de descarte de las líneas rechazadas.
+        full_tweet (bool): Si el validador necesita el tweet completo o le basta con los
+                           campos proyectados.
+    """
+
+    full_tweet = False
+
+    def __init__(self, fields: Iterable[str] = tuple(FIELD_CHECKS), dead_letter: Optional[str] = None):
+        self.fields = tuple(fields)
+        self.rejections = Counter()
+        self.errors = Counter()
+        self.rejected = 0
+        self.log = RejectionLog(dead_letter)
+        self._checks = [(field, FIELD_CHECKS[field]) for field in self.fields]
+
+    def __call__(self, tweet: dict) -> bool:
+        if not isinstance(tweet, dict):
+            self._count(self.explain(tweet))
+            return False
+        for _, check in self._checks:
+            if not check(tweet):
+                self._count(self.explain(tweet))
+                return False
+        return True
+
+    def explain(self, tweet: dict) -> List[Tuple[str, str]]:
+        """
+        Devuelve los errores de un tweet como pares (campo, tipo de error), sin contarlos.
+        Una línea que no es JSON válido (projection.UNDECODABLE) es ("tweet", "json").
+        """
+        if tweet is UNDECODABLE:
+            return [("tweet", "json")]
+        if not isinstance(tweet, dict):
+            return [("tweet", "type")]
+        return [(field, _error_type(tweet, field)) for field, check in self._checks if not check(tweet)]
+
+    def reject(self, lines: List, tweets: List[dict]) -> None:
+        """
+        Recibe las líneas rechazadas de un lote (y sus tweets, en el mismo orden).
+        """
+        if self.log.wants_samples:
+            for line, tweet in zip(lines, tweets):
+                self.log.add_sample(line, self.explain(tweet))
+                if not self.log.wants_samples:
+                    break
+        self.log.add_lines(lines)
+
+    def summary(self) -> dict:
+        """
+        Devuelve un resumen serializable de los rechazos: total, conteos por campo y por
+        tipo de error, y los ejemplos.
+        """
+        return {
+            "rejected": self.rejected,
+            "fields": dict(self.rejections),
+            "errors": errors_by_field(self.errors),
+            "samples": self.log.samples,
+        }
+
+    def merge(self, other: "FieldValidator") -> None:
+        self.rejections.update(other.rejections)
+        self.errors.update(other.errors)
+        self.rejected += other.rejected
+        self.log.merge(other.log)
+
+    def _count(self, errors: List[Tuple[str, str]]) -> None:
+        self.rejected += 1
+        self.rejections.update({field for field, _ in errors})
+        self.errors.update(errors)
+
+
+class ModelValidator(FieldValidator):
+    """
+    Validador completo con TweetModel. Registra los rechazos por campo del esquema y por
+    tipo de error de pydantic.
+    """
+
+    full_tweet = True
+
+    def __call__(self, tweet: dict) -> bool:
+        errors = self.explain(tweet)
+        if errors:
+            self._count(errors)
+        return not errors
+
+    def explain(self, tweet: dict) -> List[Tuple[str, str]]:
+        if tweet is UNDECODABLE:
+            return [("tweet", "json")]
+        if not isinstance(tweet, dict):
+            return [("tweet", "type")]
+        return tweet_errors(tweet)
+
+
+VALIDATORS = {
+    "fast": FieldValidator,
+    "full": ModelValidator,
+}
@@ -0,0 +1,50 @@
+from typing import Callable, List, Tuple
+import numpy as np
+
+
+def top_days_by_user(day: np.ndarray, user: np.ndarray, n: int = 10,
+                     user_key: Callable[[int], object] = int) -> List[Tuple[int, int]]:
+    """
+    Calcula con NumPy las n fechas con más tweets y el usuario con más publicaciones en cada una,
+    a partir de columnas codificadas como enteros.
+
+    Los empates se resuelven igual que en engine.DateUserAggregator: a igual total gana la
+    fecha más antigua y, dentro de una fecha, a igual conteo el usuario con menor `user_key`.
+
+    Args:
+        day (np.ndarray): Ordinal de la fecha de cada tweet.
+        user (np.ndarray): Id entero del usuario de cada tweet.
+        n (int): Cantidad de fechas a devolver.
+        user_key (Callable[[int], object]): Clave de desempate de un id de usuario (por
+                                            ejemplo, su nombre). Solo se evalúa para los
+                                            usuarios empatados en el primer lugar.
+
+    Returns:
+        List[Tuple[int, int]]: Pares (ordinal de la fecha, id del usuario) ordenados por
+                               cantidad de tweets de la fecha en orden descendente.
+    """
+    day = np.asarray(day)
+    user = np.asarray(user, dtype=np.int64)
+    if day.size == 0:
+        return []
+
+    # Totales por fecha; np.unique ordena las fechas, así que a igual total queda primero la más antigua
+    days, day_index, day_total = np.unique(day, return_inverse=True, return_counts=True)
+    top = np.argsort(-day_total, kind="stable")[:n]
+
+    # Conteo por (fecha, usuario) solo en las filas de las fechas seleccionadas
+    width = int(user.max()) + 1
+    rows = np.flatnonzero(np.isin(day_index, top))
+    pairs, pair_count = np.unique(day_index[rows].astype(np.int64) * width + user[rows], return_counts=True)
+    pair_day = pairs // width
+
+    # Usuarios con el conteo máximo de cada fecha; entre ellos gana el de menor user_key
+    maximum = np.zeros(len(days), dtype=np.int64)
+    np.maximum.at(maximum, pair_day, pair_count)
+    leaders = {}
+    for index, candidate in zip(*np.divmod(pairs[pair_count == maximum[pair_day]], width)):
+        index, candidate = int(index), int(candidate)
+        if index not in leaders or user_key(candidate) < user_key(leaders[index]):
+            leaders[index] = candidate
+
+    return [(int(days[index]), leaders[int(index)]) for index in top.tolist()]
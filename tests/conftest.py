@@ -0,0 +1,28 @@
+import os
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.join(ROOT, "src", "cloud_functions", "tweets"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import generate_tweets
+
+
+@pytest.fixture(scope="session")
+def tweets_file(tmp_path_factory) -> str:
+    """
+    Archivo de tweets sintéticos compartido por las pruebas (con algunas fechas inválidas).
+    """
+    file_path = str(tmp_path_factory.mktemp("data") / "tweets.json")
+    generate_tweets(file_path, 3000, users=300, days=12, invalid_ratio=0.01, seed=7)
+    return file_path
+
+
+@pytest.fixture(autouse=True)
+def clear_results_cache():
+    import engine
+    engine._results_cache.clear()
+    yield
+    engine._results_cache.clear()
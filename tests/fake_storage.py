@@ -0,0 +1,62 @@
+import io
+from typing import Dict, Optional
+
+
+class FakeBlob:
+    """
+    Objeto de un bucket falso: guarda su contenido en memoria y cuenta las lecturas.
+    """
+
+    def __init__(self, name: str, data: bytes, generation: int = 1):
+        self.name = name
+        self.data = data
+        self.generation = generation
+        self.size = len(data)
+        self.opens = 0
+
+    def open(self, mode: str = "rb", chunk_size: Optional[int] = None):
+        self.opens += 1
+        return io.BytesIO(self.data)
+
+
+class FakeBucket:
+    def __init__(self, client: "FakeClient", name: str):
+        self.client = client
+        self.name = name
+
+    def blob(self, file_path: str, generation: Optional[int] = None) -> FakeBlob:
+        blob = self.client.objects[file_path]
+        if generation is not None and generation != blob.generation:
+            raise FileNotFoundError(f"{file_path}#{generation}")
+        return blob
+
+    def get_blob(self, file_path: str) -> Optional[FakeBlob]:
+        return self.client.objects.get(file_path)
+
+
+class FakeClient:
+    """
+    Cliente de storage falso con la parte de la API que usan gcs.py y main.py: bucket(),
+    Bucket.blob(generation=...), Bucket.get_blob(), Blob.open() y list_blobs(prefix=...).
+
+    Attributes:
+        objects (Dict[str, FakeBlob]): Objetos del bucket, por ruta.
+    """
+
+    def __init__(self, objects: Optional[Dict[str, bytes]] = None):
+        self.objects = {}
+        for file_path, data in (objects or {}).items():
+            self.upload(file_path, data)
+
+    def upload(self, file_path: str, data: bytes) -> FakeBlob:
+        # Sobrescribir un objeto le asigna una generación nueva, como en GCS
+        previous = self.objects.get(file_path)
+        blob = FakeBlob(file_path, data, previous.generation + 1 if previous else 1)
+        self.objects[file_path] = blob
+        return blob
+
+    def bucket(self, bucket_name: str) -> FakeBucket:
+        return FakeBucket(self, bucket_name)
+
+    def list_blobs(self, bucket_name: str, prefix: Optional[str] = None):
+        return [blob for name, blob in sorted(self.objects.items()) if name.startswith(prefix or "")]
@@ -0,0 +1,126 @@
+import gzip
+import pytest
+import engine
+import gcs
+import main
+from cache import MemoryCache
+from fake_storage import FakeClient
+
+
+class FakeRequest:
+    def __init__(self, body: dict):
+        self.body = body
+
+    def get_json(self, silent: bool = False) -> dict:
+        return self.body
+
+
+def expected(file_path: str, validation: str = "full") -> dict:
+    result = engine.analyze_file(file_path, validation=validation, use_cache=False)
+    return {name: result[name].top(10) for name in engine.AGGREGATORS}
+
+
+def split_lines(data: bytes, parts: int) -> list:
+    lines = data.splitlines(keepends=True)
+    size = -(-len(lines) // parts)
+    return [b"".join(lines[index:index + size]) for index in range(0, len(lines), size)]
+
+
+@pytest.fixture
+def data(tweets_file) -> bytes:
+    with open(tweets_file, "rb") as file:
+        return file.read()
+
+
+@pytest.fixture
+def client(monkeypatch) -> FakeClient:
+    client = FakeClient()
+    monkeypatch.setattr(gcs, "_client", client)
+    monkeypatch.setattr(main, "result_cache", MemoryCache())
+    return client
+
+
+def test_single_object(client, data, tweets_file):
+    client.upload("tweets/all.json", data)
+
+    response = main.tweets(FakeRequest({"bucket_name": "bucket", "file_path": "tweets/all.json"}))
+
+    assert {name: response[name] for name in engine.AGGREGATORS} == expected(tweets_file)
+    assert response["metrics"]["objects"] == 1
+    assert response["metrics"]["rejections"]["rejected"] > 0
+
+
+def test_q1_memory_keeps_original_response(client, data, tweets_file):
+    client.upload("tweets/all.json", data)
+
+    response = main.q1_memory(FakeRequest({"bucket_name": "bucket", "file_path": "tweets/all.json"}))
+
+    assert response["top_dates"] == expected(tweets_file)["q1"]
+    assert response["metrics"]["queries"] == ["q1"]
+
+
+def test_prefix_merges_every_object(client, data, tweets_file):
+    for index, part in enumerate(split_lines(data, 3)):
+        client.upload(f"tweets/part-{index}.json", part)
+    client.upload("tweets/", b"")
+    client.upload("other/extra.json", data)
+
+    response = main.tweets(FakeRequest({"bucket_name": "bucket", "prefix": "tweets/", "max_concurrency": 2}))
+
+    assert {name: response[name] for name in engine.AGGREGATORS} == expected(tweets_file)
+    assert response["metrics"]["objects"] == 3
+    assert client.objects["other/extra.json"].opens == 0
+
+
+def test_compressed_objects(client, data, tweets_file):
+    client.upload("tweets/all.json.gz", gzip.compress(data))
+    body = {"bucket_name": "bucket", "file_path": "tweets/all.json.gz", "queries": ["q2", "q3"]}
+
+    response = main.tweets(FakeRequest(body))
+
+    want = expected(tweets_file)
+    assert (response["q2"], response["q3"]) == (want["q2"], want["q3"])
+
+
+def test_zstd_object(client, data, tweets_file):
+    zstandard = pytest.importorskip("zstandard")
+    client.upload("tweets/all.json.zst", zstandard.ZstdCompressor().compress(data))
+
+    response = main.tweets(FakeRequest({"bucket_name": "bucket", "file_path": "tweets/all.json.zst"}))
+
+    assert {name: response[name] for name in engine.AGGREGATORS} == expected(tweets_file)
+
+
+def test_reads_pinned_generation(client, data):
+    client.upload("tweets/all.json", data[:1000])
+    client.upload("tweets/all.json", data)
+
+    lines = list(gcs.iter_lines_from_gcs("bucket", "tweets/all.json", chunk_size=4096, generation=2))
+    assert lines == data.rstrip(b"\n").split(b"\n")
+    with pytest.raises(FileNotFoundError):
+        list(gcs.iter_lines_from_gcs("bucket", "tweets/all.json", generation=1))
+
+
+def test_cache_hit_until_an_object_changes(client, data):
+    parts = split_lines(data, 2)
+    client.upload("tweets/a.json", parts[0])
+    client.upload("tweets/b.json", parts[1])
+    request = FakeRequest({"bucket_name": "bucket", "prefix": "tweets/"})
+
+    first = main.tweets(request)
+    second = main.tweets(request)
+    assert not first["metrics"]["cache_hit"]
+    assert second["metrics"]["cache_hit"]
+    assert second["q1"] == first["q1"]
+    assert client.objects["tweets/a.json"].opens == 1
+
+    # Sobrescribir un objeto cambia su generación y con ella la llave del caché
+    client.upload("tweets/b.json", parts[0])
+    third = main.tweets(request)
+    assert not third["metrics"]["cache_hit"]
+    assert client.objects["tweets/a.json"].opens == 2
+
+
+def test_unknown_query_is_rejected(client):
+    response, status = main.tweets(FakeRequest({"bucket_name": "bucket", "file_path": "x", "queries": ["q9"]}))
+    assert status == 400
@@ -0,0 +1,45 @@
+import shutil
+import pytest
+import engine
+from column_cache import build_column_cache, cache_path
+
+
+def answers(result: dict) -> dict:
+    return {name: result[name].top(10) for name in engine.AGGREGATORS}
+
+
+@pytest.fixture(scope="module")
+def serial(tweets_file) -> dict:
+    engine._results_cache.clear()
+    result = engine.analyze_file(tweets_file, use_cache=False)
+    return {"answers": answers(result), "rejected": result["validation"].rejected}
+
+
+@pytest.mark.parametrize("options", [
+    {"workers": 3},
+    {"backend": "compact"},
+    {"backend": "dict"},
+    {"backend": "numpy"},
+    {"backend": "dict", "workers": 2},
+    {"backend": "numpy", "workers": 2},
+])
+def test_modes_match_serial(tweets_file, serial, options):
+    result = engine.analyze_file(tweets_file, use_cache=False, **options)
+    assert answers(result) == serial["answers"]
+    assert result["validation"].rejected == serial["rejected"]
+
+
+@pytest.mark.parametrize("backend", sorted(engine.Q1_BACKENDS))
+def test_column_cache_matches_serial(tweets_file, serial, backend):
+    build_column_cache(tweets_file)
+    try:
+        result = engine.analyze_file(tweets_file, backend=backend)
+        assert answers(result) == serial["answers"]
+        assert result["validation"].rejected == serial["rejected"]
+    finally:
+        shutil.rmtree(cache_path(tweets_file))
+
+
+def test_checkpoint_matches_serial(tweets_file, serial, tmp_path):
+    result = engine.analyze_file(tweets_file, checkpoint=str(tmp_path / "state.ckpt"))
+    assert answers(result) == serial["answers"]